@@ -16,6 +16,8 @@ DEFAULT_MODEL = "qwen2.5-coder:0.5b"
 DEFAULT_TEMPERATURE = 0.7
 DEFAULT_MAX_ATTEMPTS = 3
 DEFAULT_CHECK_UPDATES = True
+DEFAULT_JOURNAL_MAX_LINES = 1000  # Journal entries fetched when analyzing a service's logs
+DEFAULT_JOURNAL_SINCE = "-7d"  # How far back a service's journal is read
 
 # Default UI settings
 DEFAULT_UI_SETTINGS = {
@@ -42,6 +44,8 @@ def load_config() -> Dict:
         'temperature': DEFAULT_TEMPERATURE,
         'max_attempts': DEFAULT_MAX_ATTEMPTS,
         'check_updates': DEFAULT_CHECK_UPDATES,
+        'journal_max_lines': DEFAULT_JOURNAL_MAX_LINES,
+        'journal_since': DEFAULT_JOURNAL_SINCE,
         'ui': DEFAULT_UI_SETTINGS,
         'colors': Colors.get_all_colors()
     }
@@ -104,6 +108,8 @@ def handle_config_command(args):
         print(f"  {Colors.CYAN}temperature: {Colors.END}{config.get('temperature', DEFAULT_TEMPERATURE)}")
         print(f"  {Colors.CYAN}max_attempts: {Colors.END}{config.get('max_attempts', DEFAULT_MAX_ATTEMPTS)}")
         print(f"  {Colors.CYAN}check_updates: {Colors.END}{config.get('check_updates', DEFAULT_CHECK_UPDATES)}")
+        print(f"  {Colors.CYAN}journal_max_lines: {Colors.END}{config.get('journal_max_lines', DEFAULT_JOURNAL_MAX_LINES)}")
+        print(f"  {Colors.CYAN}journal_since: {Colors.END}{config.get('journal_since', DEFAULT_JOURNAL_SINCE)}")
         
         print(f"\n{Colors.BOLD}UI Settings:{Colors.END}")
         ui_config = config.get('ui', {})
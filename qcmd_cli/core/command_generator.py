@@ -3,6 +3,7 @@
 Command generation functionality for QCMD.
 """
 import os
+import re
 import json
 import time
 import requests
@@ -18,6 +19,9 @@ from ..config.settings import DEFAULT_MODEL
 OLLAMA_API = "http://127.0.0.1:11434/api"
 REQUEST_TIMEOUT = 30  # Timeout for API requests in seconds
 
+# Sleep used for retry backoff; a module attribute so tests can replace it
+_sleep = time.sleep
+
 # Additional dangerous patterns for improved detection
 DANGEROUS_PATTERNS = [
     # File system operations
@@ -37,6 +41,139 @@ DANGEROUS_PATTERNS = [
     "userdel -r root", "passwd root", "deluser --remove-home"
 ]
 
+# All dangerous patterns compiled once into a single case-insensitive matcher
+_DANGEROUS_RE = re.compile("|".join(re.escape(pattern) for pattern in DANGEROUS_PATTERNS), re.IGNORECASE)
+
+# Commands considered risky when run through sudo or doas
+_PRIVILEGED_RISKY_COMMANDS = ("rm", "mkfs", "dd", "fdisk", "chmod", "chown", "mv")
+
+# Circuit breaker for generation requests: after CIRCUIT_THRESHOLD consecutive timeouts,
+# connection errors or 5xx responses, skip requests for CIRCUIT_COOLDOWN seconds; one
+# attempt is then let through
+CIRCUIT_THRESHOLD = 5
+CIRCUIT_COOLDOWN = 30  # seconds
+_CIRCUIT = {"fail_count": 0, "opened_at": 0.0}
+
+def reset_circuit() -> None:
+    """
+    Close the generation circuit breaker and forget previous failures.
+    """
+    _CIRCUIT["fail_count"] = 0
+    _CIRCUIT["opened_at"] = 0.0
+
+def _circuit_open() -> bool:
+    """
+    Check whether recent failures mean generation requests should be skipped.
+    
+    Returns:
+        True while the failure threshold is reached and the cooldown has not elapsed
+    """
+    return (_CIRCUIT["fail_count"] >= CIRCUIT_THRESHOLD
+            and time.monotonic() - _CIRCUIT["opened_at"] < CIRCUIT_COOLDOWN)
+
+def _record_failure() -> None:
+    """
+    Count a failed generation attempt towards opening the circuit breaker.
+    """
+    _CIRCUIT["fail_count"] += 1
+    _CIRCUIT["opened_at"] = time.monotonic()
+
+def _is_server_failure(error: requests.exceptions.RequestException) -> bool:
+    """
+    Check whether a request error means the API itself is failing.
+    
+    Client errors such as 404 for an unknown model say nothing about the API's
+    health, so only 5xx responses count towards the circuit breaker.
+    
+    Args:
+        error: The error raised for a generation request
+        
+    Returns:
+        True if the error carries a 5xx response
+    """
+    response = getattr(error, "response", None)
+    return response is not None and response.status_code >= 500
+
+# Multiline markdown code block: opening fence with optional language, body, optional closing fence
+_FENCE_RE = re.compile(r"\A```([^\n]*)\n(.*?)(?:\n```)?\s*\Z", re.DOTALL)
+
+def _strip_markdown(text: str, keep_language: bool = False) -> str:
+    """
+    Remove markdown code formatting from a model response.
+    
+    Args:
+        text: The stripped response text
+        keep_language: Whether to keep a code block's language tag as the first line
+        
+    Returns:
+        The text without the surrounding code fence or backticks
+    """
+    match = _FENCE_RE.match(text)
+    if match:
+        language, body = match.groups()
+        return f"{language}\n{body}" if keep_language and language else body
+    if text.startswith("```") and text.endswith("```"):
+        # Handle single line code blocks with triple backticks
+        return text[3:-3].strip()
+    if text.startswith("`") and text.endswith("`"):
+        # Handle inline code with single backticks
+        return text[1:-1].strip()
+    return text
+
+def _try_fallback_model(payload: Dict[str, Any], model: str, available_models: List[str]) -> Optional[str]:
+    """
+    Retry a failed generation request once with the default model.
+    
+    Args:
+        payload: The request payload that failed; its model is replaced in place
+        model: The model that was originally requested
+        available_models: Models reported by the Ollama API
+        
+    Returns:
+        The command generated by the default model, or None if no fallback was possible
+    """
+    if not available_models or model == DEFAULT_MODEL or DEFAULT_MODEL not in available_models:
+        return None
+        
+    print(f"{Colors.YELLOW}Trying with fallback model {DEFAULT_MODEL}...{Colors.END}")
+    try:
+        # Use the default model as fallback
+        payload["model"] = DEFAULT_MODEL
+        response = requests.post(f"{OLLAMA_API}/generate", json=payload, timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+        result = response.json()
+        command = result.get("response", "").strip()
+        if command:
+            print(f"{Colors.GREEN}Successfully generated command with fallback model.{Colors.END}")
+            return command
+    except Exception:
+        # Fallback failed as well
+        pass
+    return None
+
+def _circuit_open_command(payload: Dict[str, Any], model: str, available_models: List[str]) -> str:
+    """
+    Answer a generation request while the circuit breaker is open.
+    
+    Args:
+        payload: The request payload; its model is replaced in place for the fallback
+        model: The model that was originally requested
+        available_models: Models reported by the Ollama API
+        
+    Returns:
+        The command generated by the fallback model, or an error echo command
+    """
+    print(f"{Colors.RED}Error: Ollama API failed {_CIRCUIT['fail_count']} times in a row; "
+          f"not retrying for {CIRCUIT_COOLDOWN} seconds.{Colors.END}", file=sys.stderr)
+    
+    # Try fallback if the original model isn't available
+    command = _try_fallback_model(payload, model, available_models)
+    if command:
+        return command
+        
+    print(f"{Colors.YELLOW}Make sure Ollama is running with 'ollama serve'{Colors.END}", file=sys.stderr)
+    return "echo 'Error: Command generation failed - API connection issue'"
+
 def generate_command(prompt: str, model: str = DEFAULT_MODEL, temperature: float = 0.2) -> str:
     """
     Generate a shell command from a natural language description.
@@ -63,21 +200,25 @@ Output only the exact command with no introduction, explanation, or markdown for
     except:
         pass
         
+    # Prepare the request payload
+    payload = {
+        "model": model,
+        "prompt": formatted_prompt,
+        "system": system_prompt,
+        "stream": False,
+        "temperature": temperature,
+    }
+    
     # Try with the specified model first
     max_retries = 3
     retry_delay = 2  # seconds
     
     for attempt in range(max_retries):
-        try:
-            # Prepare the request payload
-            payload = {
-                "model": model,
-                "prompt": formatted_prompt,
-                "system": system_prompt,
-                "stream": False,
-                "temperature": temperature,
-            }
+        # Skip the request entirely while the API keeps failing
+        if _circuit_open():
+            return _circuit_open_command(payload, model, available_models)
             
+        try:
             if attempt > 0:
                 print(f"{Colors.YELLOW}Retry attempt {attempt+1}/{max_retries}...{Colors.END}")
             else:
@@ -90,54 +231,38 @@ Output only the exact command with no introduction, explanation, or markdown for
             
             # Extract the command from the response
             command = result.get("response", "").strip()
+            reset_circuit()
             
             # Clean up the command (remove any markdown formatting)
-            if command.startswith("```") and "\n" in command:
-                # Handle multiline code blocks
-                lines = command.split("\n")
-                command = "\n".join(lines[1:-1] if lines[-1] == "```" else lines[1:])
-            elif command.startswith("```") and command.endswith("```"):
-                # Handle single line code blocks with triple backticks
-                command = command[3:-3].strip()
-            elif command.startswith("`") and command.endswith("`"):
-                # Handle inline code with single backticks
-                command = command[1:-1].strip()
-                
-            return command
+            return _strip_markdown(command)
                 
         except requests.exceptions.Timeout:
+            _record_failure()
+            if _circuit_open():
+                return _circuit_open_command(payload, model, available_models)
             if attempt < max_retries - 1:
                 print(f"{Colors.YELLOW}Request timed out. Retrying in {retry_delay} seconds...{Colors.END}")
-                time.sleep(retry_delay)
+                _sleep(retry_delay)
                 retry_delay *= 2  # Exponential backoff
                 continue
             else:
                 print(f"{Colors.RED}Error: Request to Ollama API timed out after {REQUEST_TIMEOUT} seconds.{Colors.END}")
                 
                 # Try fallback if the original model isn't available
-                if available_models and model != DEFAULT_MODEL and DEFAULT_MODEL in available_models:
-                    print(f"{Colors.YELLOW}Trying with fallback model {DEFAULT_MODEL}...{Colors.END}")
-                    try:
-                        # Use the default model as fallback
-                        payload["model"] = DEFAULT_MODEL
-                        response = requests.post(f"{OLLAMA_API}/generate", json=payload, timeout=REQUEST_TIMEOUT)
-                        response.raise_for_status()
-                        result = response.json()
-                        command = result.get("response", "").strip()
-                        if command:
-                            print(f"{Colors.GREEN}Successfully generated command with fallback model.{Colors.END}")
-                            return command
-                    except:
-                        # Fallback failed as well
-                        pass
+                command = _try_fallback_model(payload, model, available_models)
+                if command:
+                    return command
                         
                 print(f"{Colors.YELLOW}Please check if Ollama is running and responsive.{Colors.END}")
                 return "echo 'Error: Command generation failed due to timeout'"
                 
         except requests.exceptions.ConnectionError:
+            _record_failure()
+            if _circuit_open():
+                return _circuit_open_command(payload, model, available_models)
             if attempt < max_retries - 1:
                 print(f"{Colors.YELLOW}Connection error. Retrying in {retry_delay} seconds...{Colors.END}")
-                time.sleep(retry_delay)
+                _sleep(retry_delay)
                 retry_delay *= 2  # Exponential backoff
                 continue
             else:
@@ -146,30 +271,22 @@ Output only the exact command with no introduction, explanation, or markdown for
                 return "echo 'Error: Command generation failed - API connection issue'"
                 
         except requests.exceptions.RequestException as e:
+            if _is_server_failure(e):
+                _record_failure()
+                if _circuit_open():
+                    return _circuit_open_command(payload, model, available_models)
             if attempt < max_retries - 1:
                 print(f"{Colors.YELLOW}Request error: {e}. Retrying in {retry_delay} seconds...{Colors.END}")
-                time.sleep(retry_delay)
+                _sleep(retry_delay)
                 retry_delay *= 2  # Exponential backoff
                 continue
             else:
                 print(f"{Colors.RED}Error connecting to Ollama API: {e}{Colors.END}", file=sys.stderr)
                 
                 # Try fallback if the original model isn't available
-                if available_models and model != DEFAULT_MODEL and DEFAULT_MODEL in available_models:
-                    print(f"{Colors.YELLOW}Trying with fallback model {DEFAULT_MODEL}...{Colors.END}")
-                    try:
-                        # Use the default model as fallback
-                        payload["model"] = DEFAULT_MODEL
-                        response = requests.post(f"{OLLAMA_API}/generate", json=payload, timeout=REQUEST_TIMEOUT)
-                        response.raise_for_status()
-                        result = response.json()
-                        command = result.get("response", "").strip()
-                        if command:
-                            print(f"{Colors.GREEN}Successfully generated command with fallback model.{Colors.END}")
-                            return command
-                    except:
-                        # Fallback failed as well
-                        pass
+                command = _try_fallback_model(payload, model, available_models)
+                if command:
+                    return command
                         
                 print(f"{Colors.YELLOW}Make sure Ollama is running with 'ollama serve'{Colors.END}", file=sys.stderr)
                 return "echo 'Error: Command generation failed - API connection issue'"
@@ -177,7 +294,7 @@ Output only the exact command with no introduction, explanation, or markdown for
         except Exception as e:
             if attempt < max_retries - 1:
                 print(f"{Colors.YELLOW}Unexpected error: {e}. Retrying in {retry_delay} seconds...{Colors.END}")
-                time.sleep(retry_delay)
+                _sleep(retry_delay)
                 retry_delay *= 2  # Exponential backoff
                 continue
             else:
@@ -290,12 +407,7 @@ Output only the exact fixed command with no introduction, explanation, or markdo
         fixed_command = result.get("response", "").strip()
         
         # Clean up the command (remove any markdown formatting)
-        if fixed_command.startswith("```") and fixed_command.endswith("```"):
-            fixed_command = fixed_command[3:-3].strip()
-        elif fixed_command.startswith("`") and fixed_command.endswith("`"):
-            fixed_command = fixed_command[1:-1].strip()
-            
-        return fixed_command
+        return _strip_markdown(fixed_command, keep_language=True).strip()
             
     except Exception as e:
         print(f"{Colors.RED}Error generating fixed command: {e}{Colors.END}", file=sys.stderr)
@@ -322,7 +434,8 @@ def list_models() -> List[str]:
         print(f"{Colors.YELLOW}Error listing models: {e}{Colors.END}", file=sys.stderr)
         return []
 
-def execute_command(command: str, analyze_errors: bool = False, model: str = DEFAULT_MODEL) -> Tuple[int, str]:
+def execute_command(command: str, analyze_errors: bool = False, model: str = DEFAULT_MODEL,
+                    timeout: int = 60) -> Tuple[int, str]:
     """
     Execute a shell command and capture output.
     
@@ -330,6 +443,7 @@ def execute_command(command: str, analyze_errors: bool = False, model: str = DEF
         command: The command to execute
         analyze_errors: Whether to analyze errors if the command fails
         model: The model to use for error analysis
+        timeout: Seconds to wait for the command before killing it
         
     Returns:
         Tuple of (return_code, output)
@@ -357,7 +471,7 @@ def execute_command(command: str, analyze_errors: bool = False, model: str = DEF
         
         # Use a timeout (60 seconds by default)
         try:
-            stdout, stderr = process.communicate(timeout=60)
+            stdout, stderr = process.communicate(timeout=timeout)
             return_code = process.returncode
             
             # Combine stdout and stderr
@@ -373,7 +487,7 @@ def execute_command(command: str, analyze_errors: bool = False, model: str = DEF
         except subprocess.TimeoutExpired:
             process.kill()
             _, _ = process.communicate()
-            return (1, "Command execution timed out after 60 seconds.")
+            return (1, f"Command execution timed out after {timeout} seconds.")
             
     except Exception as e:
         return (1, f"Error executing command: {e}")
@@ -388,21 +502,20 @@ def is_dangerous_command(command: str) -> bool:
     Returns:
         True if the command appears potentially dangerous
     """
-    command_lower = command.lower()
-    
     # Check for common dangerous patterns
-    for pattern in DANGEROUS_PATTERNS:
-        if pattern.lower() in command_lower:
-            return True
+    if _DANGEROUS_RE.search(command):
+        return True
+        
+    command_lower = command.lower()
             
     # Check for commands that might delete or overwrite system files
     if ("rm" in command_lower) and ("/" in command_lower) and not ("./") in command_lower:
         return True
         
     # Check for sudo or doas with potentially risky commands
-    if ("sudo" in command_lower or "doas" in command_lower) and any(risky in command_lower for risky in [
-        "rm", "mkfs", "dd", "fdisk", "chmod", "chown", "mv"
-    ]):
+    if ("sudo" in command_lower or "doas" in command_lower) and any(
+        risky in command_lower for risky in _PRIVILEGED_RISKY_COMMANDS
+    ):
         return True
         
     return False 
\ No newline at end of file
@@ -19,7 +19,7 @@ from datetime import datetime
 from qcmd_cli.config.settings import DEFAULT_MODEL
 from qcmd_cli.config.constants import CONFIG_DIR
 from qcmd_cli.ui.display import Colors, print_cool_header, clear_screen
-from qcmd_cli.core.command_generator import generate_command, is_dangerous_command, list_models, fix_command
+from qcmd_cli.core.command_generator import generate_command, is_dangerous_command, list_models, fix_command, analyze_error
 from qcmd_cli.utils.history import save_to_history, load_history, show_history
 from qcmd_cli.utils.system import execute_command, get_system_status, display_update_status, display_system_status
 from qcmd_cli.log_analysis.log_files import handle_log_analysis
@@ -35,6 +35,11 @@ class SimpleCompleter:
     """
     def __init__(self, options):
         self.options = options
+        # Bucket options by first character so a prefix only scans its own bucket
+        self._by_first_char = {}
+        for option in options:
+            if option:
+                self._by_first_char.setdefault(option[0], []).append(option)
         
     def complete(self, text, state):
         """
@@ -44,7 +49,8 @@ class SimpleCompleter:
         if state == 0:
             # This is the first time for this text, so build a match list
             if text:
-                self.matches = [s for s in self.options if s and s.startswith(text)]
+                bucket = self._by_first_char.get(text[0], ())
+                self.matches = bucket if len(text) == 1 else [s for s in bucket if s.startswith(text)]
             else:
                 self.matches = self.options[:]
         
@@ -56,6 +62,148 @@ class SimpleCompleter:
             
         return response
 
+def _cmd_help(state: dict, arg: str) -> None:
+    """Handle /help: show the shell help."""
+    _show_shell_help()
+
+def _cmd_history(state: dict, arg: str) -> None:
+    """Handle /history: show the commands generated in this session."""
+    if state['history']:
+        print(f"\n{Colors.CYAN}Command History (this session):{Colors.END}")
+        for i, (cmd_desc, cmd) in enumerate(state['history'], 1):
+            print(f"{Colors.BLUE}{i}.{Colors.END} {cmd_desc}")
+            print(f"   {Colors.GREEN}{cmd}{Colors.END}")
+    else:
+        print(f"{Colors.YELLOW}No commands in this session yet.{Colors.END}")
+
+def _cmd_models(state: dict, arg: str) -> None:
+    """Handle /models: list the available models."""
+    models = list_models()
+    if models:
+        print(f"\n{Colors.CYAN}Available Models:{Colors.END}")
+        for i, model in enumerate(models, 1):
+            current = " (current)" if model == state['model'] else ""
+            print(f"{i}. {Colors.GREEN}{model}{Colors.END}{current}")
+    else:
+        print(f"{Colors.YELLOW}No models available or could not connect to Ollama.{Colors.END}")
+
+def _cmd_status(state: dict, arg: str) -> None:
+    """Handle /status: show system status."""
+    print(f"\n{Colors.CYAN}Getting system status...{Colors.END}")
+    display_system_status()
+
+def _cmd_update(state: dict, arg: str) -> None:
+    """Handle /update: check for QCMD updates."""
+    display_update_status()
+
+def _cmd_model(state: dict, arg: str) -> None:
+    """Handle /model <name_or_index>: switch models."""
+    try:
+        # Check if input is a number (index from listed models)
+        if arg.isdigit():
+            idx = int(arg) - 1
+            models = list_models()
+            if 0 <= idx < len(models):
+                state['model'] = models[idx]
+                print(f"Switched to model: {Colors.GREEN}{state['model']}{Colors.END}")
+            else:
+                print(f"{Colors.YELLOW}Invalid model index.{Colors.END}")
+        else:
+            # Direct model name
+            state['model'] = arg
+            print(f"Switched to model: {Colors.GREEN}{state['model']}{Colors.END}")
+    except Exception as e:
+        print(f"{Colors.YELLOW}Error switching models: {e}{Colors.END}")
+
+def _cmd_temperature(state: dict, arg: str) -> None:
+    """Handle /temperature <value>: set the generation temperature."""
+    try:
+        temp = float(arg)
+        if 0.0 <= temp <= 1.0:
+            state['temperature'] = temp
+            print(f"Temperature set to: {Colors.GREEN}{state['temperature']}{Colors.END}")
+        else:
+            print(f"{Colors.YELLOW}Temperature must be between 0.0 and 1.0{Colors.END}")
+    except ValueError:
+        print(f"{Colors.YELLOW}Invalid temperature value. Use a number between 0.0 and 1.0{Colors.END}")
+
+def _cmd_auto(state: dict, arg: str) -> None:
+    """Handle /auto: enable auto mode."""
+    state['auto_mode'] = True
+    print(f"{Colors.GREEN}Auto mode enabled.{Colors.END}")
+
+def _cmd_manual(state: dict, arg: str) -> None:
+    """Handle /manual: disable auto mode."""
+    state['auto_mode'] = False
+    print(f"{Colors.GREEN}Auto mode disabled.{Colors.END}")
+
+def _cmd_analyze(state: dict, arg: str) -> None:
+    """Handle /analyze: toggle error analysis."""
+    state['analyze_errors'] = not state['analyze_errors']
+    status = "enabled" if state['analyze_errors'] else "disabled"
+    print(f"{Colors.GREEN}Error analysis {status}.{Colors.END}")
+
+def _cmd_logs(state: dict, arg: str) -> None:
+    """Handle /logs: find and analyze log files."""
+    handle_log_analysis(state['model'])
+
+def _cmd_analyze_file(state: dict, arg: str) -> None:
+    """Handle /analyze-file <path>: analyze a specific file."""
+    file_path = os.path.expanduser(arg)
+    if os.path.isfile(file_path):
+        analyze_log_file(file_path, state['model'])
+    else:
+        print(f"{Colors.YELLOW}File not found: {file_path}{Colors.END}")
+
+def _cmd_monitor(state: dict, arg: str) -> None:
+    """Handle /monitor <path>: monitor a specific file with AI analysis."""
+    file_path = os.path.expanduser(arg)
+    if os.path.isfile(file_path):
+        analyze_log_file(file_path, state['model'], background=True)
+    else:
+        print(f"{Colors.YELLOW}File not found: {file_path}{Colors.END}")
+
+def _cmd_execute(state: dict, arg: str) -> None:
+    """Handle /execute: execute the last generated command after confirmation."""
+    if not state['history']:
+        print(f"{Colors.YELLOW}No commands in history to execute.{Colors.END}")
+        return
+        
+    _, last_cmd = state['history'][-1]
+    print(f"\n{Colors.CYAN}Executing:{Colors.END} {Colors.GREEN}{last_cmd}{Colors.END}")
+    
+    # Confirm execution
+    input(f"Press {Colors.YELLOW}Enter{Colors.END} to execute or Ctrl+C to cancel: ")
+    
+    # Execute the command
+    exit_code, output = execute_command(last_cmd, state['analyze_errors'], state['model'])
+    
+    # Display results
+    status = f"{Colors.GREEN}Success{Colors.END}" if exit_code == 0 else f"{Colors.RED}Failed (exit code: {exit_code}){Colors.END}"
+    print(f"\n{Colors.CYAN}Status:{Colors.END} {status}")
+    
+    if state['analyze_errors'] and exit_code != 0:
+        _analyze_and_fix_error(last_cmd, output, state['model'])
+
+# Built-in shell commands: name -> (handler, whether the command takes an argument).
+# Looked up once per input line instead of walking an if/elif chain.
+_SHELL_COMMANDS = {
+    '/help': (_cmd_help, False),
+    '/history': (_cmd_history, False),
+    '/models': (_cmd_models, False),
+    '/status': (_cmd_status, False),
+    '/update': (_cmd_update, False),
+    '/model': (_cmd_model, True),
+    '/temperature': (_cmd_temperature, True),
+    '/auto': (_cmd_auto, False),
+    '/manual': (_cmd_manual, False),
+    '/analyze': (_cmd_analyze, False),
+    '/logs': (_cmd_logs, False),
+    '/analyze-file': (_cmd_analyze_file, True),
+    '/monitor': (_cmd_monitor, True),
+    '/execute': (_cmd_execute, False),
+}
+
 def start_interactive_shell(
     auto_mode_enabled: bool = False, 
     current_model: str = DEFAULT_MODEL, 
@@ -113,9 +261,14 @@ def start_interactive_shell(
     print(f"\nEnter your command descriptions or type {Colors.YELLOW}/help{Colors.END} for more options.")
     print(f"{Colors.YELLOW}Type /exit to quit{Colors.END}")
     
-    # Command history for the current session
-    session_history = []
-    analyze_errors = True
+    # Mutable shell settings and the command history for the current session
+    state = {
+        'model': current_model,
+        'temperature': current_temperature,
+        'auto_mode': auto_mode_enabled,
+        'analyze_errors': True,
+        'history': [],
+    }
     
     # Cleanup stale sessions on startup
     cleanup_stale_sessions()
@@ -165,162 +318,18 @@ def start_interactive_shell(
                     end_session(session_id)
                     break
                     
-                elif user_input.lower() == '/help':
-                    _show_shell_help()
-                    continue
-                    
-                elif user_input.lower() == '/history':
-                    # Show command history
-                    if session_history:
-                        print(f"\n{Colors.CYAN}Command History (this session):{Colors.END}")
-                        for i, (cmd_desc, cmd) in enumerate(session_history, 1):
-                            print(f"{Colors.BLUE}{i}.{Colors.END} {cmd_desc}")
-                            print(f"   {Colors.GREEN}{cmd}{Colors.END}")
-                    else:
-                        print(f"{Colors.YELLOW}No commands in this session yet.{Colors.END}")
-                    continue
-                    
-                elif user_input.lower() == '/models':
-                    # List available models
-                    models = list_models()
-                    if models:
-                        print(f"\n{Colors.CYAN}Available Models:{Colors.END}")
-                        for i, model in enumerate(models, 1):
-                            current = " (current)" if model == current_model else ""
-                            print(f"{i}. {Colors.GREEN}{model}{Colors.END}{current}")
-                    else:
-                        print(f"{Colors.YELLOW}No models available or could not connect to Ollama.{Colors.END}")
-                    continue
-                    
-                elif user_input.lower() == '/status':
-                    # Show system status
-                    print(f"\n{Colors.CYAN}Getting system status...{Colors.END}")
-                    display_system_status()
-                    continue
-                    
-                elif user_input.lower() == '/update':
-                    # Check for updates
-                    display_update_status()
-                    continue
-                    
-                elif user_input.lower().startswith('/model '):
-                    # Switch models
-                    parts = user_input.split(maxsplit=1)
-                    if len(parts) == 2:
-                        try:
-                            # Check if input is a number (index from listed models)
-                            if parts[1].isdigit():
-                                idx = int(parts[1]) - 1
-                                models = list_models()
-                                if 0 <= idx < len(models):
-                                    current_model = models[idx]
-                                    print(f"Switched to model: {Colors.GREEN}{current_model}{Colors.END}")
-                                else:
-                                    print(f"{Colors.YELLOW}Invalid model index.{Colors.END}")
-                            else:
-                                # Direct model name
-                                current_model = parts[1]
-                                print(f"Switched to model: {Colors.GREEN}{current_model}{Colors.END}")
-                        except Exception as e:
-                            print(f"{Colors.YELLOW}Error switching models: {e}{Colors.END}")
-                    else:
-                        print(f"{Colors.YELLOW}Usage: /model <model_name_or_index>{Colors.END}")
-                    continue
-                    
-                elif user_input.lower().startswith('/temperature '):
-                    # Set temperature
-                    parts = user_input.split(maxsplit=1)
-                    if len(parts) == 2:
-                        try:
-                            temp = float(parts[1])
-                            if 0.0 <= temp <= 1.0:
-                                current_temperature = temp
-                                print(f"Temperature set to: {Colors.GREEN}{current_temperature}{Colors.END}")
-                            else:
-                                print(f"{Colors.YELLOW}Temperature must be between 0.0 and 1.0{Colors.END}")
-                        except ValueError:
-                            print(f"{Colors.YELLOW}Invalid temperature value. Use a number between 0.0 and 1.0{Colors.END}")
-                    else:
-                        print(f"{Colors.YELLOW}Usage: /temperature <value>{Colors.END}")
-                    continue
-                    
-                elif user_input.lower() == '/auto':
-                    # Enable auto mode
-                    auto_mode_enabled = True
-                    print(f"{Colors.GREEN}Auto mode enabled.{Colors.END}")
-                    continue
-                    
-                elif user_input.lower() == '/manual':
-                    # Disable auto mode
-                    auto_mode_enabled = False
-                    print(f"{Colors.GREEN}Auto mode disabled.{Colors.END}")
-                    continue
-                    
-                elif user_input.lower() == '/analyze':
-                    # Toggle error analysis
-                    analyze_errors = not analyze_errors
-                    status = "enabled" if analyze_errors else "disabled"
-                    print(f"{Colors.GREEN}Error analysis {status}.{Colors.END}")
-                    continue
-                    
-                elif user_input.lower() == '/logs':
-                    # Find and analyze log files
-                    handle_log_analysis(current_model)
-                    continue
-                    
-                elif user_input.lower().startswith('/analyze-file '):
-                    # Analyze a specific file
-                    parts = user_input.split(maxsplit=1)
-                    if len(parts) == 2:
-                        file_path = os.path.expanduser(parts[1])
-                        if os.path.isfile(file_path):
-                            analyze_log_file(file_path, current_model)
-                        else:
-                            print(f"{Colors.YELLOW}File not found: {file_path}{Colors.END}")
-                    else:
-                        print(f"{Colors.YELLOW}Usage: /analyze-file <file_path>{Colors.END}")
-                    continue
-                    
-                elif user_input.lower().startswith('/monitor '):
-                    # Monitor a specific file with AI analysis
-                    parts = user_input.split(maxsplit=1)
-                    if len(parts) == 2:
-                        file_path = os.path.expanduser(parts[1])
-                        if os.path.isfile(file_path):
-                            analyze_log_file(file_path, current_model, background=True)
-                        else:
-                            print(f"{Colors.YELLOW}File not found: {file_path}{Colors.END}")
-                    else:
-                        print(f"{Colors.YELLOW}Usage: /monitor <file_path>{Colors.END}")
-                    continue
-                    
-                elif user_input.lower() == '/execute':
-                    # Execute last command
-                    if session_history:
-                        _, last_cmd = session_history[-1]
-                        print(f"\n{Colors.CYAN}Executing:{Colors.END} {Colors.GREEN}{last_cmd}{Colors.END}")
-                        
-                        # Confirm execution
-                        confirm = input(f"Press {Colors.YELLOW}Enter{Colors.END} to execute or Ctrl+C to cancel: ")
-                        
-                        # Execute the command
-                        exit_code, output = execute_command(last_cmd, analyze_errors, current_model)
-                        
-                        # Display results
-                        status = f"{Colors.GREEN}Success{Colors.END}" if exit_code == 0 else f"{Colors.RED}Failed (exit code: {exit_code}){Colors.END}"
-                        print(f"\n{Colors.CYAN}Status:{Colors.END} {status}")
-                        
-                        if analyze_errors and exit_code != 0:
-                            _analyze_and_fix_error(last_cmd, output, current_model)
-                    else:
-                        print(f"{Colors.YELLOW}No commands in history to execute.{Colors.END}")
+                # Dispatch built-in /commands through the command table
+                parts = user_input.split(maxsplit=1)
+                entry = _SHELL_COMMANDS.get(parts[0].lower())
+                if entry is not None and entry[1] == (len(parts) == 2):
+                    entry[0](state, parts[1] if len(parts) == 2 else '')
                     continue
                     
                 # Process regular input as a command request
                 print(f"\n{Colors.CYAN}Generating command...{Colors.END}")
                 
                 # Generate the command
-                command = generate_command(user_input, current_model, current_temperature)
+                command = generate_command(user_input, state['model'], state['temperature'])
                 
                 # Display the generated command
                 if command.startswith("Error:"):
@@ -335,17 +344,17 @@ def start_interactive_shell(
                     print(f"{Colors.RED}Review it carefully before execution.{Colors.END}")
                     
                 # Add to session history
-                session_history.append((user_input, command))
+                state['history'].append((user_input, command))
                 
                 # Save to global history
                 save_to_history(user_input)
                 
                 # Handle auto mode
-                if auto_mode_enabled:
+                if state['auto_mode']:
                     print(f"\n{Colors.CYAN}Auto-executing command...{Colors.END}")
                     
                     # Execute the command
-                    exit_code, output = execute_command(command, False, current_model)
+                    exit_code, output = execute_command(command, False, state['model'])
                     
                     # Display results
                     status = f"{Colors.GREEN}Success{Colors.END}" if exit_code == 0 else f"{Colors.RED}Failed (exit code: {exit_code}){Colors.END}"
@@ -353,7 +362,7 @@ def start_interactive_shell(
                     
                     # Handle errors in auto mode
                     if exit_code != 0:
-                        _auto_fix_and_execute(command, output, current_model, max_attempts)
+                        _auto_fix_and_execute(command, output, state['model'], max_attempts)
                 else:
                     # Interactive mode with options to execute, edit, or skip
                     print(f"\n{Colors.CYAN}Options:{Colors.END}")
@@ -367,15 +376,15 @@ def start_interactive_shell(
                             
                             if choice == 'y':
                                 # Execute the command
-                                exit_code, output = execute_command(command, analyze_errors, current_model)
+                                exit_code, output = execute_command(command, state['analyze_errors'], state['model'])
                                 
                                 # Display results
                                 status = f"{Colors.GREEN}Success{Colors.END}" if exit_code == 0 else f"{Colors.RED}Failed (exit code: {exit_code}){Colors.END}"
                                 print(f"\n{Colors.CYAN}Status:{Colors.END} {status}")
                                 
                                 # Handle errors if enabled
-                                if analyze_errors and exit_code != 0:
-                                    _analyze_and_fix_error(command, output, current_model)
+                                if state['analyze_errors'] and exit_code != 0:
+                                    _analyze_and_fix_error(command, output, state['model'])
                                 break
                                 
                             elif choice == 'n':
@@ -405,21 +414,21 @@ def start_interactive_shell(
                                         print(f"\n{Colors.CYAN}Updated command:{Colors.END} {Colors.GREEN}{command}{Colors.END}")
                                         
                                         # Update session history
-                                        session_history[-1] = (user_input, command)
+                                        state['history'][-1] = (user_input, command)
                                         
                                         # Ask for execution confirmation
                                         sub_choice = input(f"\n{Colors.BOLD}Execute this command now? (y/n):{Colors.END} ").strip().lower()
                                         if sub_choice == 'y':
                                             # Execute the command
-                                            exit_code, output = execute_command(command, analyze_errors, current_model)
+                                            exit_code, output = execute_command(command, state['analyze_errors'], state['model'])
                                             
                                             # Display results
                                             status = f"{Colors.GREEN}Success{Colors.END}" if exit_code == 0 else f"{Colors.RED}Failed (exit code: {exit_code}){Colors.END}"
                                             print(f"\n{Colors.CYAN}Status:{Colors.END} {status}")
                                             
                                             # Handle errors if enabled
-                                            if analyze_errors and exit_code != 0:
-                                                _analyze_and_fix_error(command, output, current_model)
+                                            if state['analyze_errors'] and exit_code != 0:
+                                                _analyze_and_fix_error(command, output, state['model'])
                                     else:
                                         print(f"{Colors.YELLOW}No changes made to the command.{Colors.END}")
                                 except KeyboardInterrupt:
@@ -503,8 +512,6 @@ def _analyze_and_fix_error(command: str, output: str, model: str) -> None:
         output: The error output
         model: Model to use for analysis
     """
-    from qcmd_cli.core.command_generator import analyze_error, fix_command
-    
     print(f"\n{Colors.CYAN}Analyzing error...{Colors.END}")
     analysis = analyze_error(output, command, model)
     print(f"\n{Colors.CYAN}Analysis:{Colors.END}\n{analysis}")
@@ -539,8 +546,6 @@ def _auto_fix_and_execute(command: str, output: str, model: str, max_attempts: i
         model: Model to use for fixing
         max_attempts: Maximum number of fix attempts
     """
-    from qcmd_cli.core.command_generator import fix_command
-    
     original_command = command
     attempts = 1
     
@@ -3,96 +3,234 @@
 Log file discovery and selection functionality for QCMD CLI.
 """
 import os
+import re
 import json
+import stat
 import time
+import shutil
 import tempfile
+import threading
 import subprocess
-from typing import List, Optional, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import List, Optional, Dict, Any, Protocol
 
-from ..config.settings import DEFAULT_MODEL, CONFIG_DIR
+try:
+    # Optional: read the systemd journal through libsystemd instead of running journalctl
+    from cysystemd.reader import JournalReader, JournalOpenMode, Rule
+except ImportError:
+    JournalReader = None
+
+from ..config.settings import (
+    DEFAULT_MODEL, CONFIG_DIR, DEFAULT_JOURNAL_MAX_LINES, DEFAULT_JOURNAL_SINCE, load_config
+)
 from ..ui.display import Colors
 from .analyzer import analyze_log_file, analyze_log_content, read_large_file
 
 # Cache settings
 LOG_CACHE_FILE = os.path.join(CONFIG_DIR, "log_cache.json")
 LOG_CACHE_EXPIRY = 3600  # Cache expires after 1 hour (in seconds)
+LOG_SCAN_LIMIT = 100  # Log files listed from LOG_LOCATIONS, in total and per directory tree
+LOG_SCAN_WORKERS = 8  # Directory trees searched in parallel
+JOURNAL_COPY_CHUNK = 1 << 20  # Characters copied per read when streaming journalctl output
+LOG_MEMO_TTL = 60  # Reuse the last result within one process for 60 seconds
+
+# MESSAGE_ID of systemd-coredump's entries
+COREDUMP_MESSAGE_ID = "fc2e22bc6ee647b6b90729ab34a250b1"
+
+# Relative journalctl --since specs such as "-7d" or "-12h", and the seconds in each unit
+_RELATIVE_SINCE_RE = re.compile(r"-\s*(\d+)\s*([a-z]+)")
+_SINCE_UNITS = {
+    "s": 1, "sec": 1, "second": 1, "seconds": 1,
+    "m": 60, "min": 60, "minute": 60, "minutes": 60,
+    "h": 3600, "hr": 3600, "hour": 3600, "hours": 3600,
+    "d": 86400, "day": 86400, "days": 86400,
+    "w": 604800, "week": 604800, "weeks": 604800,
+}
+
+# Common log locations
+LOG_LOCATIONS = [
+    "/var/log/",
+    "/var/log/syslog",
+    "/var/log/auth.log",
+    "/var/log/dmesg",
+    "/var/log/kern.log",
+    "/var/log/apache2/",
+    "/var/log/nginx/",
+    "/var/log/mysql/",
+    "/var/log/postgresql/",
+    "~/.local/share/",
+    "/opt/",
+    "/tmp/",
+]
+
+# Locations that change too often to invalidate the memo on; handle_log_selection itself
+# writes journal captures to /tmp. New logs there show up once LOG_MEMO_TTL expires
+_VOLATILE_LOG_LOCATIONS = frozenset({"~/.local/share/", "/tmp/"})
+
+# Last result of find_log_files with the default cache, for repeat listings in a session,
+# and the state of LOG_LOCATIONS it was found in
+_LOG_MEMO = {"log_files": None, "stored_at": 0.0, "roots": None}
+
+def reset_log_memo() -> None:
+    """
+    Forget the in-process find_log_files result, so the next call searches again.
+    """
+    _LOG_MEMO["log_files"] = None
+    _LOG_MEMO["stored_at"] = 0.0
+    _LOG_MEMO["roots"] = None
+
+def _log_roots_state() -> tuple:
+    """
+    Observe LOG_LOCATIONS, apart from _VOLATILE_LOG_LOCATIONS, cheaply enough
+    to check before reusing the memo.
+    
+    A directory is represented by its modification time, which changes when
+    entries are added to or removed from it; a file only by its existence,
+    since writes to it do not change the list of log files.
+    
+    Returns:
+        One entry per observed location: None if it is missing, True for a
+        file, or the directory's st_mtime_ns
+    """
+    state = []
+    for location in LOG_LOCATIONS:
+        if location in _VOLATILE_LOG_LOCATIONS:
+            continue
+        try:
+            st = os.stat(os.path.expanduser(location))
+        except OSError:
+            state.append(None)
+            continue
+        state.append(st.st_mtime_ns if stat.S_ISDIR(st.st_mode) else True)
+    return tuple(state)
+
+def _remember(log_files: List[str], roots: tuple) -> List[str]:
+    """
+    Store a find_log_files result in the in-process memo.
+    
+    Args:
+        log_files: The result to remember
+        roots: _log_roots_state() from before the result was found
+        
+    Returns:
+        The same result
+    """
+    _LOG_MEMO["log_files"] = list(log_files)
+    _LOG_MEMO["stored_at"] = time.monotonic()
+    _LOG_MEMO["roots"] = roots
+    return log_files
+
+class _LogCache(Protocol):
+    """
+    Store for the find_log_files result.
+    """
+    def load(self) -> Optional[Dict[str, Any]]: ...
+
+    def save(self, data: Dict[str, Any]) -> None: ...
+
+class _JsonFileCache:
+    """
+    Log file list cache stored as JSON in LOG_CACHE_FILE.
+    """
+    def load(self) -> Optional[Dict[str, Any]]:
+        """
+        Load the cached data.
+        
+        Returns:
+            The cached data, or None if there is no cache yet
+        """
+        if not os.path.exists(LOG_CACHE_FILE):
+            return None
+        with open(LOG_CACHE_FILE, 'r') as f:
+            return json.load(f)
+
+    def save(self, data: Dict[str, Any]) -> None:
+        """
+        Replace the cached data.
+        
+        Args:
+            data: Data to cache
+        """
+        with open(LOG_CACHE_FILE, 'w') as f:
+            json.dump(data, f)
+
+_default_cache = _JsonFileCache()
 
-def find_log_files(include_system: bool = False) -> List[str]:
+def find_log_files(include_system: bool = False, cache: Optional[_LogCache] = None) -> List[str]:
     """
     Find log files in common locations in the system.
     
+    With the default cache, a result from the last LOG_MEMO_TTL seconds is
+    reused without searching, as long as no file or directory in
+    LOG_LOCATIONS, other than the frequently changing /tmp and
+    ~/.local/share, has appeared, disappeared or had entries added or
+    removed since; call reset_log_memo() to force a fresh lookup.
+    
+    Args:
+        include_system: Currently unused
+        cache: Store for the file list, with load() and save(data) methods;
+            defaults to the JSON file at LOG_CACHE_FILE
+    
     Returns:
         List of paths to log files
     """
+    use_memo = cache is None
+    if use_memo:
+        roots = _log_roots_state()
+        if (_LOG_MEMO["log_files"] is not None
+                and time.monotonic() - _LOG_MEMO["stored_at"] < LOG_MEMO_TTL
+                and _LOG_MEMO["roots"] == roots):
+            return list(_LOG_MEMO["log_files"])
+        cache = _default_cache
+        
     # Check if we have a valid cache
-    if os.path.exists(LOG_CACHE_FILE):
-        try:
-            with open(LOG_CACHE_FILE, 'r') as f:
-                cache_data = json.load(f)
-                cache_time = cache_data.get('timestamp', 0)
-                log_files = cache_data.get('log_files', [])
+    try:
+        cache_data = cache.load()
+        if cache_data is not None:
+            cache_time = cache_data.get('timestamp', 0)
+            log_files = cache_data.get('log_files', [])
+            
+            # If cache is still valid (not expired)
+            if time.time() - cache_time < LOG_CACHE_EXPIRY:
+                print(f"{Colors.BLUE}Using cached log file list.{Colors.END}")
                 
-                # If cache is still valid (not expired)
-                if time.time() - cache_time < LOG_CACHE_EXPIRY:
-                    print(f"{Colors.BLUE}Using cached log file list.{Colors.END}")
-                    
-                    # Include favorite logs from config (in case they were added after caching)
-                    from ..config.settings import load_config
-                    config = load_config()
-                    favorite_logs = config.get('favorite_logs', [])
-                    for log in favorite_logs:
-                        if os.path.exists(log) and os.path.isfile(log) and os.access(log, os.R_OK):
-                            if log not in log_files:
-                                log_files.append(log)
-                                
-                    return log_files
-        except (json.JSONDecodeError, IOError):
-            # Cache file is invalid, continue with normal search
-            pass
+                # Include favorite logs from config (in case they were added after caching)
+                config = load_config()
+                favorite_logs = config.get('favorite_logs', [])
+                for log in favorite_logs:
+                    if os.path.exists(log) and os.path.isfile(log) and os.access(log, os.R_OK):
+                        if log not in log_files:
+                            log_files.append(log)
+                            
+                return _remember(log_files, roots) if use_memo else log_files
+    except (json.JSONDecodeError, IOError):
+        # Cache is invalid, continue with normal search
+        pass
             
-    # Common log locations
-    log_locations = [
-        "/var/log/",
-        "/var/log/syslog",
-        "/var/log/auth.log",
-        "/var/log/dmesg",
-        "/var/log/kern.log",
-        "/var/log/apache2/",
-        "/var/log/nginx/",
-        "/var/log/mysql/",
-        "/var/log/postgresql/",
-        "~/.local/share/",
-        "/opt/",
-        "/tmp/",
-    ]
-    
     log_files = []
     
     # Expand home directory
-    log_locations = [os.path.expanduser(loc) for loc in log_locations]
+    log_locations = [os.path.expanduser(loc) for loc in LOG_LOCATIONS]
     
     print(f"{Colors.BLUE}Searching for log files...{Colors.END}")
     
     try:
-        # First check specific log files
+        # First check specific log files, collecting directories to search
+        log_dirs = []
         for location in log_locations:
             if os.path.isfile(location) and os.access(location, os.R_OK):
                 log_files.append(location)
             elif os.path.isdir(location) and os.access(location, os.R_OK):
-                # For directories, find log files inside
-                for root, dirs, files in os.walk(location, topdown=True, followlinks=False):
-                    # Limit depth to avoid searching too deep
-                    if root.count(os.sep) - location.count(os.sep) > 2:
-                        continue
-                        
-                    # Add log files
-                    for file in files:
-                        if is_log_file(file) and os.access(os.path.join(root, file), os.R_OK):
-                            log_files.append(os.path.join(root, file))
-                            
-                    # Limit to max 100 files to avoid overloading
-                    if len(log_files) > 100:
-                        break
+                log_dirs.append(location)
+                
+        # Search the directories in parallel; the work is mostly directory-read syscalls
+        if log_dirs:
+            with ThreadPoolExecutor(max_workers=min(LOG_SCAN_WORKERS, len(log_dirs))) as pool:
+                for found in pool.map(_scan_log_dir, log_dirs):
+                    log_files.extend(found)
+            # Each tree is capped separately, so cap the merged list to keep the menu short
+            del log_files[LOG_SCAN_LIMIT:]
         
         # Add any running service logs from systemd
         systemd_logs = []
@@ -121,7 +259,6 @@ def find_log_files(include_system: bool = False) -> List[str]:
             print(f"{Colors.YELLOW}Systemd service enumeration timed out, skipping service logs.{Colors.END}")
         
         # Include favorite logs from config
-        from ..config.settings import load_config
         config = load_config()
         favorite_logs = config.get('favorite_logs', [])
         for log in favorite_logs:
@@ -131,20 +268,52 @@ def find_log_files(include_system: bool = False) -> List[str]:
         
         # Cache the results
         try:
-            with open(LOG_CACHE_FILE, 'w') as f:
-                json.dump({
-                    'timestamp': time.time(),
-                    'log_files': sorted(set(log_files))
-                }, f)
+            cache.save({
+                'timestamp': time.time(),
+                'log_files': sorted(set(log_files))
+            })
         except (IOError, OSError) as e:
             print(f"{Colors.YELLOW}Could not cache log file list: {e}{Colors.END}")
         
-        return sorted(set(log_files))  # Remove duplicates
+        log_files = sorted(set(log_files))  # Remove duplicates
+        return _remember(log_files, roots) if use_memo else log_files
         
     except Exception as e:
         print(f"{Colors.RED}Error searching for log files: {e}{Colors.END}")
         return []
 
+def _scan_log_dir(location: str) -> List[str]:
+    """
+    Find readable log files in a directory tree without following symlinked directories.
+    
+    Args:
+        location: Directory to search
+        
+    Returns:
+        Paths of the log files found, at most a little over LOG_SCAN_LIMIT
+    """
+    found = []
+    pending = [location]
+    while pending and len(found) <= LOG_SCAN_LIMIT:
+        directory = pending.pop()
+        try:
+            entries = os.scandir(directory)
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    continue
+                if is_dir:
+                    # Limit depth to avoid searching too deep
+                    if not entry.is_symlink() and entry.path.count(os.sep) - location.count(os.sep) <= 2:
+                        pending.append(entry.path)
+                elif is_log_file(entry.name) and os.access(entry.path, os.R_OK):
+                    found.append(entry.path)
+    return found
+
 def is_log_file(filename: str) -> bool:
     """
     Check if a file is likely a log file based on its name.
@@ -161,6 +330,9 @@ def is_log_file(filename: str) -> bool:
             'debug' in filename.lower() or 
             'error' in filename.lower())
 
+# Replies that cancel the log file selection
+_QUIT_CHOICES = frozenset({'q', 'quit', 'exit'})
+
 def display_log_selection(log_files: List[str]) -> Optional[str]:
     """
     Display a menu of log files and let the user select one.
@@ -204,18 +376,21 @@ def display_log_selection(log_files: List[str]) -> Optional[str]:
     
     while True:
         try:
-            choice = input(f"\n{Colors.GREEN}Enter number to select a log file (or q to cancel): {Colors.END}")
+            choice = input(f"\n{Colors.GREEN}Enter number to select a log file (or q to cancel): {Colors.END}").strip()
             
-            if choice.lower() in ['q', 'quit', 'exit']:
+            if choice.lower() in _QUIT_CHOICES:
                 return None
                 
-            choice = int(choice)
-            if choice in file_indices:
-                return file_indices[choice]
-            else:
-                print(f"{Colors.YELLOW}Invalid selection '{choice}'. Please enter a number between 1 and {len(file_indices)}.{Colors.END}")
-        except ValueError:
-            print(f"{Colors.YELLOW}Please enter a number or 'q' to cancel.{Colors.END}")
+            # Check for a (possibly signed) number up front rather than catching int()'s ValueError
+            digits = choice[1:] if choice.startswith(('+', '-')) else choice
+            if not digits.isdecimal():
+                print(f"{Colors.YELLOW}Please enter a number or 'q' to cancel.{Colors.END}")
+                continue
+                
+            index = int(choice)
+            if index in file_indices:
+                return file_indices[index]
+            print(f"{Colors.YELLOW}Invalid selection '{index}'. Please enter a number between 1 and {len(file_indices)}.{Colors.END}")
         except KeyboardInterrupt:
             print(f"\n{Colors.YELLOW}Operation cancelled.{Colors.END}")
             return None
@@ -306,6 +481,178 @@ def handle_log_analysis(model: str = DEFAULT_MODEL, file_path: str = None) -> No
         else:
             print(f"{Colors.YELLOW}Invalid choice. Exiting log analysis.{Colors.END}")
 
+def _since_usec(since: str) -> Optional[int]:
+    """
+    Convert a journalctl --since time spec into a realtime timestamp.
+    
+    Understands relative specs such as "-7d" and ISO dates such as
+    "2024-05-10 12:00:00", read as local time like journalctl does.
+    
+    Args:
+        since: The time spec
+        
+    Returns:
+        Microseconds since the epoch, or None if the spec is in a form only
+        journalctl understands
+    """
+    match = _RELATIVE_SINCE_RE.fullmatch(since.strip())
+    if match:
+        count, unit = match.groups()
+        if unit not in _SINCE_UNITS:
+            return None
+        return int((time.time() - int(count) * _SINCE_UNITS[unit]) * 1_000_000)
+    try:
+        return int(datetime.fromisoformat(since.strip()).timestamp() * 1_000_000)
+    except ValueError:
+        return None
+
+def _unit_rule(service_name: str):
+    """
+    Build the journal match journalctl -u uses for a unit.
+    
+    Besides the unit's own entries, this matches what systemd (PID 1) logs
+    about the unit, such as start, stop and "Failed with result" lines, and
+    core dumps of its processes.
+    
+    Args:
+        service_name: Name of the systemd unit
+        
+    Returns:
+        A cysystemd Rule for JournalReader.add_filter
+    """
+    return (Rule("_SYSTEMD_UNIT", service_name)
+            | (Rule("MESSAGE_ID", COREDUMP_MESSAGE_ID) & Rule("_UID", "0") & Rule("COREDUMP_UNIT", service_name))
+            | (Rule("_PID", "1") & Rule("UNIT", service_name))
+            | (Rule("_UID", "0") & Rule("OBJECT_SYSTEMD_UNIT", service_name)))
+
+def _read_journal_tail(service_name: str, max_lines: int, cutoff: Optional[int], timeout: float) -> list:
+    """
+    Read a unit's newest journal entries through cysystemd.
+    
+    Steps back from the end of the journal, so older entries are never read.
+    
+    Args:
+        service_name: Name of the systemd unit
+        max_lines: Maximum number of entries to read
+        cutoff: Realtime timestamp in microseconds to stop at, or None
+        timeout: Seconds to allow the read to run
+        
+    Returns:
+        The entries, newest first
+        
+    Raises:
+        subprocess.TimeoutExpired: If the read did not finish in time
+    """
+    reader = JournalReader()
+    try:
+        reader.open(JournalOpenMode.SYSTEM)
+        reader.add_filter(_unit_rule(service_name))
+        reader.seek_tail()
+        deadline = time.monotonic() + timeout
+        entries = []
+        while len(entries) < max_lines:
+            if time.monotonic() > deadline:
+                raise subprocess.TimeoutExpired(f"journal read for {service_name}", timeout)
+            entry = reader.previous()
+            if entry is None or (cutoff is not None and entry.get_realtime_usec() < cutoff):
+                break
+            entries.append(entry)
+        return entries
+    finally:
+        reader.close()
+
+def _capture_journal(service_name: str, out_file, max_lines: int = DEFAULT_JOURNAL_MAX_LINES,
+                     since: Optional[str] = DEFAULT_JOURNAL_SINCE, timeout: int = 10) -> None:
+    """
+    Write the most recent journal entries of a systemd service to a file.
+    
+    Uses libsystemd through cysystemd when it is installed, which avoids
+    running journalctl and reads only the entries written, walking back from
+    the newest; otherwise, or if the journal cannot be read that way, streams
+    journalctl's output straight into the file instead of holding it all in
+    memory.
+    
+    Args:
+        service_name: Name of the systemd unit, e.g. nginx.service
+        out_file: Open text file to write the entries to, one per line
+        max_lines: Maximum number of entries to write
+        since: journalctl --since time spec bounding how far back the journal
+            is read, or None for the whole journal; lets journalctl skip older
+            journal files. The cysystemd reader applies relative and ISO specs
+            itself and leaves any other spec to journalctl
+        timeout: Seconds to allow journalctl, or the journal read, to run
+        
+    Raises:
+        subprocess.TimeoutExpired: If journalctl or the journal read did not finish in time
+        subprocess.CalledProcessError: If journalctl failed
+        FileNotFoundError: If journalctl is not installed
+    """
+    cutoff = _since_usec(since) if since else None
+    if JournalReader is not None and (cutoff is not None or not since):
+        try:
+            entries = _read_journal_tail(service_name, max_lines, cutoff, timeout)
+        except subprocess.TimeoutExpired:
+            raise
+        except Exception:
+            # e.g. no permission to read the system journal; journalctl may still manage
+            entries = None
+        if entries is not None:
+            out_file.writelines(
+                f"{entry.date.isoformat()} {entry.data.get('SYSLOG_IDENTIFIER', service_name)}: "
+                f"{entry.data.get('MESSAGE', '')}\n"
+                for entry in reversed(entries)
+            )
+            return
+    
+    cmd = ["journalctl", "--no-pager", "-o", "short-iso", "-u", service_name, "-n", str(max_lines)]
+    if since:
+        cmd += ["--since", since]
+    process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, universal_newlines=True)
+    expired = threading.Event()
+    
+    def expire():
+        expired.set()
+        process.kill()
+        
+    # Killing journalctl closes its output, which ends the copy below
+    timer = threading.Timer(timeout, expire)
+    timer.start()
+    try:
+        with process.stdout:
+            shutil.copyfileobj(process.stdout, out_file, JOURNAL_COPY_CHUNK)
+        process.wait()
+    finally:
+        timer.cancel()
+        # If writing the file failed, journalctl is still running
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+        
+    if expired.is_set():
+        raise subprocess.TimeoutExpired(cmd, timeout)
+    if process.returncode:
+        raise subprocess.CalledProcessError(process.returncode, cmd)
+
+def _journal_max_lines(value: Any) -> int:
+    """
+    Validate the journal_max_lines setting.
+    
+    Args:
+        value: The configured value, which may be a string if edited by hand
+        
+    Returns:
+        The value as a positive int, or DEFAULT_JOURNAL_MAX_LINES if it is not one
+    """
+    try:
+        max_lines = int(value)
+    except (TypeError, ValueError):
+        max_lines = 0
+    if max_lines > 0:
+        return max_lines
+    print(f"{Colors.YELLOW}Invalid journal_max_lines setting {value!r}; "
+          f"using {DEFAULT_JOURNAL_MAX_LINES}.{Colors.END}")
+    return DEFAULT_JOURNAL_MAX_LINES
+
 def handle_log_selection(selected_log: str, model: str) -> None:
     """
     Handle a selected log file from the all-logs menu.
@@ -333,14 +680,14 @@ def handle_log_selection(selected_log: str, model: str) -> None:
             # Create a temporary file to store the logs
             with tempfile.NamedTemporaryFile(delete=False, mode='w+') as temp_file:
                 try:
-                    # Get logs from journalctl with timeout
-                    logs = subprocess.check_output(
-                        ["journalctl", "-u", service_name, "--no-pager", "-n", "1000"],
-                        stderr=subprocess.DEVNULL,
-                        universal_newlines=True,
-                        timeout=10  # Add timeout of 10 seconds
+                    # Write the service's recent journal entries to the file
+                    config = load_config()
+                    _capture_journal(
+                        service_name,
+                        temp_file,
+                        max_lines=_journal_max_lines(config.get('journal_max_lines', DEFAULT_JOURNAL_MAX_LINES)),
+                        since=config.get('journal_since', DEFAULT_JOURNAL_SINCE),
                     )
-                    temp_file.write(logs)
                     temp_file_path = temp_file.name
                 except subprocess.TimeoutExpired:
                     print(f"{Colors.RED}Error: journalctl command timed out.{Colors.END}")
@@ -160,6 +160,13 @@ class TestDisplaySystemStatus(unittest.TestCase):
         """Set up test environment."""
         active_log_monitors.clear()
         load_active_monitors()
+        # Keep session cleanup away from the real sessions file
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        sessions_patch = patch('qcmd_cli.utils.session.SESSIONS_FILE',
+                               os.path.join(self.temp_dir.name, "sessions.json"))
+        sessions_patch.start()
+        self.addCleanup(sessions_patch.stop)
 
     def tearDown(self):
         """Clean up after tests."""
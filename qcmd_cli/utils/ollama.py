@@ -1,3 +1,8 @@
+import requests
+
+from qcmd_cli.config.constants import OLLAMA_API
+
+
 def is_ollama_running():
     """
     Check if the Ollama API is running and accessible.
@@ -5,9 +10,6 @@ def is_ollama_running():
     Returns:
         bool: True if the Ollama API is running, False otherwise
     """
-    from qcmd_cli.config.constants import OLLAMA_API
-    import requests
-    
     try:
         response = requests.get(f"{OLLAMA_API}/tags", timeout=2)
         return response.status_code == 200
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Shared pytest fixtures for the QCMD test suite.
+"""
+import pytest
+
+
+@pytest.fixture(scope='session')
+def cg():
+    """
+    The command generator module, imported once per test session (or xdist worker).
+    """
+    import qcmd_cli.core.command_generator as module
+    return module
+
+
+@pytest.fixture(scope='session')
+def ishell():
+    """
+    The interactive shell module, imported on first use rather than at collection.
+    """
+    import qcmd_cli.core.interactive_shell as module
+    return module
+
+
+@pytest.fixture(autouse=True)
+def sleeps(cg, monkeypatch):
+    """
+    Replace the command generator's retry backoff sleep so no test ever waits.
+    
+    Returns the list of delays that were requested.
+    """
+    delays = []
+    monkeypatch.setattr(cg, '_sleep', delays.append)
+    return delays
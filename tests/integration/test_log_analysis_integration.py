@@ -6,84 +6,102 @@ These tests verify that the log selection and analysis components
 work together correctly, focusing on the interaction between these
 key components.
 """
-import sys
-import os
 import unittest
+from contextlib import ExitStack, contextmanager
 from unittest.mock import patch, Mock
-from io import StringIO
-import tempfile
+from io import IOBase, StringIO
 
-# Add parent directory to path to import modules
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+import pytest
 
 from qcmd_cli.log_analysis.log_files import handle_log_selection
-from qcmd_cli.ui.display import Colors
 
+class _NullIO(IOBase):
+    """Writable stream that discards everything, for tests that ignore stdout."""
+
+    def writable(self):
+        return True
+
+    def write(self, s):
+        return len(s)
+
+@pytest.mark.integration
 class TestLogAnalysisIntegration(unittest.TestCase):
     """
     Test cases for the integration between log selection and analysis.
     """
     
-    def setUp(self):
-        """Set up test data."""
-        # Create a temporary log file
-        self.temp_log = tempfile.NamedTemporaryFile(delete=False, mode='w+')
-        self.temp_log.write("May 10 12:34:56 server test: Test log entry\n")
-        self.temp_log.write("May 10 12:35:00 server error: Error occurred\n")
-        self.temp_log.close()
+    # Log file path the tests select; the file itself is never read
+    temp_log_name = "/tmp/fake.log"
+
+    @classmethod
+    def setUpClass(cls):
+        """Patch analyze_log_file once for the class; _patches resets it per test."""
+        cls._analyze_patcher = patch('qcmd_cli.log_analysis.log_files.analyze_log_file', autospec=True)
+        cls.mock_analyze = cls._analyze_patcher.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the class-wide analyze_log_file patch."""
+        cls._analyze_patcher.stop()
 
-    def tearDown(self):
-        """Clean up after tests."""
-        # Delete the temporary file
-        if os.path.exists(self.temp_log.name):
-            os.unlink(self.temp_log.name)
+    @contextmanager
+    def _patches(self, capture=False, **input_kwargs):
+        """
+        Reset the shared log analysis mock and patch input and stdout
+        together in one ExitStack.
+        
+        The selected log file is reported as an existing regular file, so
+        no test touches the disk.
+        
+        Args:
+            capture: Whether to keep the output in a StringIO; otherwise it is discarded
+            input_kwargs: Configuration for the input mock (return_value or side_effect)
+            
+        Yields:
+            Tuple of (stdout buffer, input mock, analyze_log_file mock)
+        """
+        self.mock_analyze.reset_mock()
+        with ExitStack() as stack:
+            mock_input = stack.enter_context(patch('builtins.input', **input_kwargs))
+            mock_stdout = stack.enter_context(patch('sys.stdout', new=StringIO() if capture else _NullIO()))
+            stack.enter_context(patch('os.path.exists', return_value=True))
+            stack.enter_context(patch('os.path.isfile', return_value=True))
+            yield mock_stdout, mock_input, self.mock_analyze
 
-    @patch('qcmd_cli.log_analysis.log_files.analyze_log_file')
-    @patch('builtins.input')
-    @patch('sys.stdout', new_callable=StringIO)
-    def test_handle_log_selection_to_analysis(self, mock_stdout, mock_input, mock_analyze):
+    def test_handle_log_selection_to_analysis(self):
         """Test the integration between log selection and log analysis."""
         # Simulate user choosing to analyze (not monitor)
-        mock_input.return_value = 'a'
-        
-        # Call handle_log_selection with our temp file
-        handle_log_selection(self.temp_log.name, "test-model")
+        with self._patches(return_value='a') as (mock_stdout, mock_input, mock_analyze):
+            # Call handle_log_selection with our temp file
+            handle_log_selection(self.temp_log_name, "test-model")
         
         # Verify analyze_log_file was called with correct parameters
         mock_analyze.assert_called_once()
         args, kwargs = mock_analyze.call_args
-        self.assertEqual(args[0], self.temp_log.name)  # File path
+        self.assertEqual(args[0], self.temp_log_name)  # File path
         self.assertEqual(args[1], "test-model")  # Model
         self.assertEqual(args[2], False)  # Not background (not monitoring)
     
-    @patch('qcmd_cli.log_analysis.log_files.analyze_log_file')
-    @patch('builtins.input')
-    @patch('sys.stdout', new_callable=StringIO)
-    def test_handle_log_selection_to_monitoring(self, mock_stdout, mock_input, mock_analyze):
+    def test_handle_log_selection_to_monitoring(self):
         """Test the integration between log selection and log monitoring."""
         # Simulate user choosing to monitor
-        mock_input.return_value = 'm'
-        
-        # Call handle_log_selection with our temp file
-        handle_log_selection(self.temp_log.name, "test-model")
+        with self._patches(return_value='m') as (mock_stdout, mock_input, mock_analyze):
+            # Call handle_log_selection with our temp file
+            handle_log_selection(self.temp_log_name, "test-model")
         
         # Verify analyze_log_file was called with monitoring=True
         mock_analyze.assert_called_once()
         args, kwargs = mock_analyze.call_args
-        self.assertEqual(args[0], self.temp_log.name)  # File path
+        self.assertEqual(args[0], self.temp_log_name)  # File path
         self.assertEqual(args[1], "test-model")  # Model
         self.assertEqual(args[2], True)  # Background=True (monitoring)
     
-    @patch('qcmd_cli.log_analysis.log_files.analyze_log_file')
-    @patch('builtins.input')
-    @patch('sys.stdout', new_callable=StringIO)
-    def test_handle_log_selection_invalid_then_valid(self, mock_stdout, mock_input, mock_analyze):
+    def test_handle_log_selection_invalid_then_valid(self):
         """Test recovery from invalid action choice in log handling."""
         # Simulate user entering invalid choice then valid
-        mock_input.side_effect = ['x', 'a']
-        
-        # Call handle_log_selection with our temp file
-        handle_log_selection(self.temp_log.name, "test-model")
+        with self._patches(capture=True, side_effect=['x', 'a']) as (mock_stdout, mock_input, mock_analyze):
+            # Call handle_log_selection with our temp file
+            handle_log_selection(self.temp_log_name, "test-model")
         
         # Should still proceed to analysis after invalid then valid input
         mock_analyze.assert_called_once()
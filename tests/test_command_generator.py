@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+"""
+Tests for the command generator module.
+
+The module under test is provided by the session-scoped ``cg`` fixture
+(see ``conftest.py``) so it is imported once per worker. The module's
+``requests`` reference is swapped for a fake namespace once per module and
+reset before every test, so no test reaches the network or patches the
+real module.
+
+Parametrized tests bind the module helpers they call as default arguments
+so the hot per-case lookups are locals rather than globals.
+"""
+from subprocess import PIPE, Popen, TimeoutExpired
+from types import SimpleNamespace
+from unittest.mock import MagicMock, call
+
+import pytest
+from requests import exceptions as req_exceptions
+from requests.exceptions import ConnectionError as ReqConnectionError, HTTPError, Timeout
+
+from qcmd_cli.config.settings import DEFAULT_MODEL
+
+_MODELS_DEFAULT_ONLY = (DEFAULT_MODEL,)
+_MODELS_DEFAULT = ("model1", "model2", DEFAULT_MODEL)
+_MODELS_WITH_DEFAULT = ("model1", DEFAULT_MODEL)
+_MODELS_NONE = ()
+
+_SUDO_DANGEROUS = ("sudo rm file.txt", "doas chmod 600 secret", "sudo mv a b")
+_PATH_DANGEROUS = ("rm /etc/passwd", "rm -f /var/log/syslog", "SHUTDOWN -h now", "MKFS.ext4 /dev/sdb1")
+_SAFE_RELATIVE = ("rm ./build.log", "ls -la /tmp", "echo hello")
+_DANGEROUS_CASES = tuple(
+    [(cmd, True) for cmd in _SUDO_DANGEROUS + _PATH_DANGEROUS]
+    + [(cmd, False) for cmd in _SAFE_RELATIVE]
+)
+# Popen's class attributes plus the ones it only sets on instances, for spec_set mocks
+_POPEN_SPEC = tuple(dir(Popen)) + ("args", "stdin", "stdout", "stderr", "pid", "returncode")
+_CONN_ERR = ReqConnectionError("Connection refused")
+_TIMEOUT_ERR = Timeout("Request timed out")
+_HTTP_ERR = HTTPError("404 Not Found")
+
+
+class _FakeResp:
+    """Minimal stand-in for an Ollama API response."""
+    __slots__ = ('_json', 'status_code')
+
+    def __init__(self, data, status_code=200):
+        self._json = data
+        self.status_code = status_code
+
+    def json(self):
+        return self._json
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise HTTPError(f"{self.status_code} Error", response=self)
+
+
+def _capture(*results):
+    """
+    Build a fake ``requests`` call that records the model each call asks for.
+
+    Args:
+        results: Responses to return, or exceptions to raise, one per call;
+            the last one is repeated once the sequence is exhausted
+
+    Returns:
+        Tuple of (fake_callable, list_of_requested_models)
+    """
+    models = []
+
+    def fake(*args, json=None, **kwargs):
+        # Read the model at call time; generate_command mutates the payload for its fallback
+        models.append(json["model"] if json else None)
+        result = results[min(len(models), len(results)) - 1]
+        if isinstance(result, BaseException):
+            raise result
+        return result
+
+    return fake, models
+
+
+def _route(routes):
+    """
+    Build a fake ``requests`` call that answers by URL, like a registered mock endpoint.
+
+    Args:
+        routes: Mapping of full URL to the response returned for it; any other
+            URL fails with a connection error
+
+    Returns:
+        Tuple of (fake_callable, list_of_requested_urls)
+    """
+    urls = []
+
+    def fake(url, *args, **kwargs):
+        urls.append(url)
+        if url not in routes:
+            raise ReqConnectionError(f"Connection refused by {url}")
+        return routes[url]
+
+    return fake, urls
+
+
+def _offline(*args, **kwargs):
+    """Default transport call: the Ollama API is unreachable."""
+    raise _CONN_ERR
+
+
+@pytest.fixture(scope='module')
+def transport(cg):
+    """
+    Install a fake ``requests`` namespace on the command generator once per module.
+    """
+    fake = SimpleNamespace(post=_offline, get=_offline, exceptions=req_exceptions)
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(cg, 'requests', fake)
+        yield fake
+
+
+@pytest.fixture(autouse=True)
+def fake_requests(cg, transport):
+    """
+    Reset the shared fake transport and the circuit breaker before each test.
+
+    Every test starts offline (calls fail with a connection error); tests
+    install their own ``post``/``get`` fakes on the returned namespace.
+    """
+    transport.post = transport.get = _offline
+    cg.reset_circuit()
+    return transport
+
+
+def test_generate_command(cg, fake_requests, monkeypatch):
+    """Test that a plain response is returned as the command."""
+    fake_post, models = _capture(_FakeResp({"response": "ls -la"}))
+    fake_requests.post = fake_post
+    monkeypatch.setattr(cg, 'list_models', lambda: _MODELS_DEFAULT_ONLY)
+
+    assert cg.generate_command("list files") == "ls -la"
+    assert models == [cg.DEFAULT_MODEL]
+
+
+def test_generate_command_endpoints(cg, fake_requests):
+    """Test that model listing and generation hit the expected Ollama endpoints."""
+    fake_requests.get, get_urls = _route({
+        f"{cg.OLLAMA_API}/tags": _FakeResp({"models": [{"name": cg.DEFAULT_MODEL}]}),
+    })
+    fake_requests.post, post_urls = _route({
+        f"{cg.OLLAMA_API}/generate": _FakeResp({"response": "ls -la"}),
+    })
+
+    assert cg.generate_command("list files") == "ls -la"
+    assert get_urls == [f"{cg.OLLAMA_API}/tags"]
+    assert post_urls == [f"{cg.OLLAMA_API}/generate"]
+
+
+@pytest.mark.parametrize("raw,expected", [
+    ("`ls -la`", "ls -la"),
+    ("```ls -la```", "ls -la"),
+    ("```\nls -la\n```", "ls -la"),
+    ("```bash\nls -la\n```", "ls -la"),
+    ("```\nls -la\ncd /tmp\n```", "ls -la\ncd /tmp"),
+    ("```\nls -la\ncd /tmp", "ls -la\ncd /tmp"),
+])
+def test_generate_command_strips_markdown(cg, fake_requests, monkeypatch, raw, expected,
+                                          _capture=_capture, _FakeResp=_FakeResp):
+    """Test that markdown wrappers are removed from generated commands."""
+    monkeypatch.setattr(cg, 'list_models', lambda: _MODELS_DEFAULT_ONLY)
+    fake_post, _ = _capture(_FakeResp({"response": raw}))
+    fake_requests.post = fake_post
+
+    assert cg.generate_command("list files") == expected
+
+
+def test_generate_command_all_timeouts(cg, fake_requests, monkeypatch, sleeps):
+    """Test that repeated timeouts back off exponentially and then give up."""
+    fake_post, models = _capture(_TIMEOUT_ERR)
+    fake_requests.post = fake_post
+    monkeypatch.setattr(cg, 'list_models', lambda: _MODELS_DEFAULT_ONLY)
+
+    assert cg.generate_command("list files") == "echo 'Error: Command generation failed due to timeout'"
+    assert models == [cg.DEFAULT_MODEL] * 3
+    assert sleeps == [2, 4]
+
+
+def test_generate_command_fallback_failure(cg, fake_requests, monkeypatch, sleeps):
+    """Test that the default-model fallback is tried once after all retries time out."""
+    fake_post, models = _capture(_TIMEOUT_ERR)
+    fake_requests.post = fake_post
+    monkeypatch.setattr(cg, 'list_models', lambda: _MODELS_DEFAULT)
+
+    assert cg.generate_command("list files", model="model1") == "echo 'Error: Command generation failed due to timeout'"
+    assert models == ["model1"] * 3 + [cg.DEFAULT_MODEL]
+    assert sleeps == [2, 4]
+
+
+def test_generate_command_fallback_success_after_timeout(cg, fake_requests, monkeypatch):
+    """Test that the default model's answer is used when the requested model times out."""
+    models = []
+
+    def fake_post(*args, json=None, **kwargs):
+        # Only the fourth call (the fallback) succeeds; build its response lazily
+        models.append(json["model"])
+        if len(models) < 4:
+            raise _TIMEOUT_ERR
+        return _FakeResp({"response": "ls -la"})
+
+    fake_requests.post = fake_post
+    monkeypatch.setattr(cg, 'list_models', lambda: _MODELS_WITH_DEFAULT)
+
+    assert cg.generate_command("list files", model="model1") == "ls -la"
+    assert models == ["model1"] * 3 + [cg.DEFAULT_MODEL]
+
+
+def test_generate_command_connection_errors(cg, fake_requests, monkeypatch, sleeps):
+    """Test that repeated connection errors report an API connection issue."""
+    fake_post, models = _capture(_CONN_ERR)
+    fake_requests.post = fake_post
+    monkeypatch.setattr(cg, 'list_models', lambda: _MODELS_NONE)
+
+    assert cg.generate_command("list files") == "echo 'Error: Command generation failed - API connection issue'"
+    assert models == [cg.DEFAULT_MODEL] * 3
+    assert sleeps == [2, 4]
+
+
+def test_generate_command_http_error_status(cg, fake_requests, monkeypatch, sleeps):
+    """Test that an error status such as 429 is retried and then reported."""
+    fake_post, models = _capture(_FakeResp({}, status_code=429))
+    fake_requests.post = fake_post
+    monkeypatch.setattr(cg, 'list_models', lambda: _MODELS_NONE)
+
+    assert cg.generate_command("list files") == "echo 'Error: Command generation failed - API connection issue'"
+    assert models == [cg.DEFAULT_MODEL] * 3
+    assert sleeps == [2, 4]
+
+
+def test_generate_command_circuit_breaker(cg, fake_requests, monkeypatch, sleeps):
+    """Test that repeated failures open the circuit and skip further requests."""
+    fake_post, models = _capture(_CONN_ERR)
+    fake_requests.post = fake_post
+    monkeypatch.setattr(cg, 'list_models', lambda: _MODELS_NONE)
+    failed = "echo 'Error: Command generation failed - API connection issue'"
+
+    assert cg.generate_command("list files") == failed
+    assert len(models) == 3
+    # The threshold is reached on the second attempt of the next call, which then returns without backing off
+    assert cg.generate_command("list files") == failed
+    assert len(models) == cg.CIRCUIT_THRESHOLD
+    assert sleeps == [2, 4, 2]
+    assert cg.generate_command("list files") == failed
+    assert len(models) == cg.CIRCUIT_THRESHOLD
+
+    # After the cooldown a single probe is let through, and success closes the circuit
+    cg._CIRCUIT["opened_at"] -= cg.CIRCUIT_COOLDOWN
+    fake_requests.post, models = _capture(_FakeResp({"response": "ls -la"}))
+    assert cg.generate_command("list files") == "ls -la"
+    assert cg._CIRCUIT["fail_count"] == 0
+
+
+@pytest.mark.parametrize("status,counted", [(404, 0), (429, 0), (500, 3), (503, 3)])
+def test_generate_command_circuit_counts_server_errors(cg, fake_requests, monkeypatch, sleeps, status, counted,
+                                                       _capture=_capture, _FakeResp=_FakeResp):
+    """Test that only 5xx responses count towards the circuit breaker, not client errors."""
+    fake_requests.post, _ = _capture(_FakeResp({}, status_code=status))
+    monkeypatch.setattr(cg, 'list_models', lambda: _MODELS_NONE)
+
+    cg.generate_command("list files", model="typo-model")
+
+    assert cg._CIRCUIT["fail_count"] == counted
+
+
+def test_generate_command_circuit_open_fallback(cg, fake_requests, monkeypatch):
+    """Test that an open circuit still tries the default-model fallback once."""
+    cg._CIRCUIT["fail_count"] = cg.CIRCUIT_THRESHOLD
+    cg._CIRCUIT["opened_at"] = cg.time.monotonic()
+    fake_requests.post, models = _capture(_FakeResp({"response": "ls -la"}))
+    monkeypatch.setattr(cg, 'list_models', lambda: _MODELS_WITH_DEFAULT)
+
+    assert cg.generate_command("list files", model="model1") == "ls -la"
+    assert models == [cg.DEFAULT_MODEL]
+
+
+@pytest.mark.parametrize("raw,expected", [
+    ("```\nls -la\n```", "ls -la"),
+    ("`ls -la`", "ls -la"),
+    ("```ls -la```", "ls -la"),
+    ("```\nfixed command\n```", "fixed command"),
+    ("`fixed command`", "fixed command"),
+    ("```bash\nls -la\n```", "bash\nls -la"),
+    ("```\nls -la\ncd /tmp\n```", "ls -la\ncd /tmp"),
+    ("```\nls -la\ngrep 'pattern'\n```", "ls -la\ngrep 'pattern'"),
+    ("```\nls -la\ncd /tmp", "ls -la\ncd /tmp"),
+])
+def test_fix_command_markdown(cg, fake_requests, raw, expected, _capture=_capture, _FakeResp=_FakeResp):
+    """Test that fix_command strips markdown wrappers from the fixed command."""
+    fake_post, _ = _capture(_FakeResp({"response": raw}))
+    fake_requests.post = fake_post
+
+    assert cg.fix_command("ls -z", "ls: invalid option -- 'z'") == expected
+
+
+def test_fix_command_api_error(cg, fake_requests):
+    """Test that the original command is returned when the API fails."""
+    fake_post, _ = _capture(_CONN_ERR)
+    fake_requests.post = fake_post
+
+    assert cg.fix_command("ls -z", "error") == "ls -z"
+
+
+def test_list_models(cg, fake_requests):
+    """Test listing models from the Ollama API."""
+    fake_get, _ = _capture(_FakeResp({"models": [{"name": "model1"}, {"name": "model2"}]}))
+    fake_requests.get = fake_get
+    assert cg.list_models() == ["model1", "model2"]
+
+
+def test_list_models_errors(cg, fake_requests):
+    """Test that API errors while listing models yield an empty list."""
+    for error in (_CONN_ERR, _TIMEOUT_ERR, _HTTP_ERR):
+        fake_get, _ = _capture(error)
+        fake_requests.get = fake_get
+        assert cg.list_models() == [], error
+
+
+@pytest.fixture(scope='module')
+def process_mock():
+    """A single Popen process mock shared (and reset) across parametrized cases."""
+    return MagicMock(spec_set=_POPEN_SPEC)
+
+
+def _make_popen_mock(stdout="", stderr="", returncode=0, timeout=False, process=None):
+    """
+    Build a ``Popen`` replacement whose process reports the given results.
+
+    Args:
+        stdout: Output returned by ``communicate``
+        stderr: Error output returned by ``communicate``
+        returncode: Exit code of the process
+        timeout: Whether the first ``communicate`` call should time out
+        process: Existing process mock to reset and reuse instead of building one
+
+    Returns:
+        Mock to install as ``subprocess.Popen``; its ``return_value`` is the process
+    """
+    if process is None:
+        process = MagicMock(spec_set=_POPEN_SPEC)
+    else:
+        process.reset_mock(return_value=True, side_effect=True)
+    process.returncode = returncode
+    if timeout:
+        process.communicate.side_effect = [TimeoutExpired("sleep 5", 1), (stdout, stderr)]
+    else:
+        process.communicate.return_value = (stdout, stderr)
+    return MagicMock(spec_set=Popen, return_value=process)
+
+
+@pytest.mark.process
+@pytest.mark.parametrize("stdout,stderr,expected", [
+    ("out", "", (0, "out")),
+    ("", "err", (0, "err")),
+    ("out", "err", (0, "out\nerr")),
+])
+def test_execute_command_output(cg, monkeypatch, process_mock, stdout, stderr, expected,
+                                _make_popen_mock=_make_popen_mock):
+    """Test that stdout and stderr are combined into the command output."""
+    monkeypatch.setattr(cg.subprocess, 'Popen', _make_popen_mock(stdout, stderr, process=process_mock))
+
+    assert cg.execute_command("ls") == expected
+
+
+@pytest.mark.process
+def test_execute_command_process_exception(cg, monkeypatch):
+    """Test that a failure to start the process is reported as an error."""
+    mock_popen = MagicMock(spec_set=Popen, side_effect=OSError("No such file"))
+    monkeypatch.setattr(cg.subprocess, 'Popen', mock_popen)
+
+    assert cg.execute_command("ls") == (1, "Error executing command: No such file")
+    assert mock_popen.call_count == 1
+    assert mock_popen.call_args == call("ls", shell=True, stdout=PIPE, stderr=PIPE, text=True)
+
+
+@pytest.mark.process
+@pytest.mark.parametrize("stdout,stderr", [(None, None), ("out", None), (None, "err"), ("out", "err")])
+def test_execute_command_timeout_variants(cg, monkeypatch, process_mock, stdout, stderr,
+                                          _make_popen_mock=_make_popen_mock):
+    """Test that a timed-out command is killed and reported regardless of partial output."""
+    mock_popen = _make_popen_mock(stdout, stderr, returncode=None, timeout=True, process=process_mock)
+    monkeypatch.setattr(cg.subprocess, 'Popen', mock_popen)
+
+    assert cg.execute_command("sleep 5", timeout=1) == (1, "Command execution timed out after 1 seconds.")
+    # kill is the shared mock's own child, so _make_popen_mock's reset clears it for the next case
+    assert process_mock.kill.call_count == 1
+
+
+@pytest.mark.safe
+def test_is_dangerous_command_additional_patterns(cg):
+    """Test sudo, absolute path and case-insensitive dangerous command detection."""
+    for cmd, expected in _DANGEROUS_CASES:
+        assert cg.is_dangerous_command(cmd) is expected, cmd
@@ -4,13 +4,8 @@ Tests for UI display functionality.
 """
 
 import unittest
-import os
-import sys
 from unittest.mock import patch, MagicMock, call
 
-# Add parent directory to path so we can import modules
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-
 # Import functions to test
 from qcmd_cli.ui.display import (
     Colors, display_system_status, display_help_command,
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Tests for the interactive shell module.
+
+The module under test is provided by the session-scoped ``ishell`` fixture
+(see ``conftest.py``), so collecting this file does not import the shell
+and its dependencies.
+"""
+from functools import partial
+from unittest.mock import patch, create_autospec, MagicMock, DEFAULT
+
+import pytest
+
+
+_OPTIONS = ['/help', '/history', '/exit', '/models', '/model', '/status', 'help', 'history', 'exit']
+
+# Module attributes that touch the terminal, the session store or the network
+_SIDE_EFFECTS = (
+    'readline', 'atexit', 'signal', 'create_session', 'end_session',
+    'cleanup_stale_sessions', 'update_session_activity', 'clear_screen',
+    '_display_banner', 'display_update_status', 'save_to_history',
+    'display_system_status', 'handle_log_analysis', 'analyze_log_file',
+)
+
+# Lines typed into the shell by the individual tests
+_SEQ_HELP = ('/help', '/exit')
+_SEQ_SETTINGS = ('/model other-model', '/temperature 0.3', 'list files', 'n')
+_SEQ_EXIT = ('/exit',)
+
+# Replies to the y/n/e prompt for a generated 'ls -la':
+# (typed lines before /exit, commands executed, text expected in the output)
+_CHOICE_CASES = (
+    pytest.param(('list files', 'y'), ('ls -la',), 'Success', id='execute'),
+    pytest.param(('list files', 'n'), (), 'Command execution skipped.', id='reject'),
+    pytest.param(('list files', 'e', 'ls -l', 'y'), ('ls -l',), 'Updated command:', id='edit'),
+    pytest.param(('list files', 'e', 'ls -l', 'n'), (), 'Updated command:', id='edit-no-execute'),
+    pytest.param(('list files', 'e', ''), (), 'No changes made to the command.', id='edit-empty'),
+)
+
+# Exceptional or empty lines at the prompt: (typed lines before /exit, text expected in the output)
+_INPUT_ERROR_CASES = (
+    pytest.param((EOFError(),), 'Goodbye!', id='eof'),
+    pytest.param((KeyboardInterrupt(),), 'Interrupted', id='sigint'),
+    pytest.param((RuntimeError('Test exception'),), 'Error: Test exception', id='generic'),
+    pytest.param(('',), 'Goodbye!', id='empty'),
+)
+
+# auto_mode runs: (execute results, fix_command result, commands executed, fixes requested)
+_AUTO_CASES = (
+    pytest.param(((0, 'out'),), None, ('ls -la',), 0, id='success'),
+    pytest.param(((1, 'err'), (0, 'out')), 'ls -a', ('ls -la', 'ls -a'), 1, id='fail-then-fix'),
+    pytest.param(((1, 'err'), (1, 'err')), 'ls -z', ('ls -la', 'ls -z'), 1, id='max-attempts'),
+)
+
+# (typed lines before /exit, text expected in the output)
+_SLASH_CASES = (
+    (('/history',), 'No commands in this session yet.'),
+    (('list files', 'n', '/history'), 'ls -la'),
+    (('/models',), '(current)'),
+    (('/model 1',), 'model-a'),
+    (('/model 9',), 'Invalid model index.'),
+    (('/temperature 0.5',), 'Temperature set to:'),
+    (('/temperature 2',), 'Temperature must be between 0.0 and 1.0'),
+    (('/temperature hot',), 'Invalid temperature value.'),
+    (('/auto',), 'Auto mode enabled.'),
+    (('/manual',), 'Auto mode disabled.'),
+    (('/analyze',), 'Error analysis disabled.'),
+    (('/analyze-file /nonexistent/app.log',), 'File not found: /nonexistent/app.log'),
+    (('/execute',), 'No commands in history to execute.'),
+    (('/status',), 'Getting system status...'),
+)
+
+
+class _Spy:
+    """Plain callable stand-in that records its calls and returns a fixed value."""
+
+    def __init__(self, ret=None):
+        self.ret = ret
+        self.calls = []
+
+    def __call__(self, *args, **kwargs):
+        self.calls.append((args, kwargs))
+        return self.ret
+
+
+@pytest.fixture
+def completer(ishell):
+    """A completer over a fixed set of shell commands."""
+    return ishell.SimpleCompleter(_OPTIONS)
+
+
+@pytest.mark.safe
+def test_complete(completer):
+    """Test the completions returned for each state."""
+    assert completer.complete('/h', 0) == '/help'
+    assert completer.complete('/h', 1) == '/history'
+    assert completer.complete('/h', 2) is None
+    assert completer.complete('/mod', 0) == '/models'
+    assert completer.complete('/mod', 1) == '/model'
+    assert completer.complete('e', 0) == 'exit'
+    assert completer.complete('x', 0) is None
+    assert completer.complete('', 0) == '/help'
+    assert completer.complete('', len(_OPTIONS) - 1) == 'exit'
+
+
+@pytest.mark.safe
+def test_complete_reuses_first_char_bucket(completer):
+    """Test that a one-character prefix reuses the prebuilt match list."""
+    completer.complete('h', 0)
+    matches = completer.matches
+    assert matches == ['help', 'history']
+
+    completer.complete('h', 0)
+    assert completer.matches is matches
+    assert completer.complete('h', 1) == 'history'
+
+
+@pytest.fixture(scope='module')
+def shell_io():
+    """
+    Replace input() and print() once per module.
+
+    Returns:
+        Tuple of (input mock, list of printed lines); per-test fixtures reset both
+    """
+    lines = []
+    mock = MagicMock()
+    with patch.multiple(
+        'builtins',
+        input=mock,
+        print=lambda *args, **kwargs: lines.append(' '.join(map(str, args))),
+    ):
+        yield mock, lines
+
+
+@pytest.fixture
+def printed(shell_io):
+    """Printed lines, joined into plain strings rather than recorded as mock calls."""
+    lines = shell_io[1]
+    lines.clear()
+    return lines
+
+
+@pytest.fixture
+def mock_input(shell_io):
+    """Replacement for input(); tests set its side_effect to the lines typed."""
+    mock = shell_io[0]
+    mock.reset_mock(side_effect=True)
+    return mock
+
+
+@pytest.fixture
+def generate():
+    return _Spy('ls -la')
+
+
+@pytest.fixture
+def execute():
+    return _Spy((0, ''))
+
+
+@pytest.fixture
+def show_help():
+    return _Spy()
+
+
+@pytest.fixture(scope='module')
+def shell_side_effects(ishell):
+    """
+    Stub the shell's terminal, session and network side effects once per module.
+
+    These stubs carry no state any test asserts on, so they are shared. The
+    clock is frozen so the periodic session-activity refresh is deterministic.
+    """
+    with patch.multiple(
+        ishell,
+        is_ollama_running=MagicMock(return_value=True),
+        list_models=MagicMock(return_value=['model-a', 'test-model']),
+        time=MagicMock(**{'time.return_value': 0.0}),
+        **dict.fromkeys(_SIDE_EFFECTS, DEFAULT),
+    ):
+        yield
+
+
+@pytest.fixture
+def shell(ishell, shell_side_effects, generate, execute, show_help):
+    """
+    Patch the shell's collaborators with this test's spies, then provide a shell starter.
+
+    Returns:
+        start_interactive_shell bound to the test model
+    """
+    with patch.multiple(
+        ishell,
+        generate_command=generate,
+        execute_command=execute,
+        _show_shell_help=show_help,
+    ):
+        yield partial(ishell.start_interactive_shell, current_model='test-model')
+
+
+def _run_shell(shell, mock_input, printed, inputs):
+    """
+    Type the given lines into the shell, then /exit.
+
+    Returns:
+        Everything the shell printed, joined into one string
+    """
+    mock_input.side_effect = iter(inputs + _SEQ_EXIT)
+    shell()
+    return '\n'.join(printed)
+
+
+@pytest.mark.parametrize("inputs,executed,expected", _CHOICE_CASES)
+def test_shell_command_choices(shell, mock_input, printed, generate, execute, inputs, executed, expected,
+                               _run_shell=_run_shell):
+    """Test executing, rejecting and editing a generated command."""
+    output = _run_shell(shell, mock_input, printed, inputs)
+
+    assert generate.calls == [(('list files', 'test-model', 0.7), {})]
+    assert [args for args, _ in execute.calls] == [(cmd, True, 'test-model') for cmd in executed]
+    assert expected in output
+
+
+def test_shell_help_command(shell, mock_input, printed, generate, show_help):
+    """Test that /help shows the help text instead of generating a command."""
+    mock_input.side_effect = iter(_SEQ_HELP)
+    shell()
+
+    assert show_help.calls == [((), {})]
+    assert generate.calls == []
+
+
+@pytest.mark.parametrize("inputs,expected", _SLASH_CASES)
+def test_shell_slash_commands(shell, mock_input, printed, inputs, expected, _run_shell=_run_shell):
+    """Test the output of each built-in shell command."""
+    assert expected in _run_shell(shell, mock_input, printed, inputs)
+
+
+@pytest.mark.parametrize("inputs,expected", _INPUT_ERROR_CASES)
+def test_shell_input_errors(shell, mock_input, printed, generate, inputs, expected, _run_shell=_run_shell):
+    """Test that EOF, interrupts, errors and empty lines at the prompt are handled without generating."""
+    assert expected in _run_shell(shell, mock_input, printed, inputs)
+    assert generate.calls == []
+
+
+def test_shell_settings_apply_to_generation(shell, mock_input, printed, generate, _run_shell=_run_shell):
+    """Test that /model and /temperature change the arguments used for generation."""
+    _run_shell(shell, mock_input, printed, _SEQ_SETTINGS)
+
+    assert generate.calls == [(('list files', 'other-model', 0.3), {})]
+
+
+def test_shell_signal_handlers(ishell, shell, mock_input, printed, _run_shell=_run_shell):
+    """Test that SIGINT/SIGTERM handlers are installed and end the session on exit."""
+    stub_signal = ishell.signal
+    stub_signal.signal.reset_mock()
+    _run_shell(shell, mock_input, printed, ())
+
+    registered = {args[0]: args[1] for args, _ in stub_signal.signal.call_args_list}
+    assert set(registered) == {stub_signal.SIGINT, stub_signal.SIGTERM}
+
+    ishell.end_session.reset_mock()
+    with pytest.raises(SystemExit):
+        registered[stub_signal.SIGINT](stub_signal.SIGINT, None)
+    ishell.end_session.assert_called_once()
+
+
+@pytest.mark.parametrize("results,fixed,executed,fixes", _AUTO_CASES)
+def test_auto_mode(ishell, shell_side_effects, printed, generate, results, fixed, executed, fixes):
+    """Test that auto mode fixes failing commands until one succeeds or attempts run out."""
+    execute = create_autospec(ishell.execute_command, side_effect=results)
+    fix = create_autospec(ishell.fix_command, return_value=fixed)
+    with patch.multiple(ishell, generate_command=generate, execute_command=execute, fix_command=fix):
+        ishell.auto_mode('list files', 'test-model', len(results), 0.7)
+
+    assert generate.calls == [(('list files', 'test-model', 0.7), {})]
+    assert [args for args, _ in execute.call_args_list] == [(cmd,) for cmd in executed]
+    assert fix.call_count == fixes
@@ -3,11 +3,8 @@
 Test script to verify that the modular imports are working correctly.
 """
 
-import os
 import sys
 
-# Add the parent directory to the path
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 def test_module_imports():
     """Test that all modules can be imported successfully."""
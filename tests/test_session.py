@@ -5,15 +5,11 @@ Tests for session management functionality.
 
 import unittest
 import os
-import sys
 import json
 import tempfile
 import time
 from unittest.mock import patch, MagicMock
 
-# Add parent directory to path so we can import modules
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-
 # Import functions to test
 from qcmd_cli.utils.session import (
     save_session, load_sessions, create_session, update_session_activity,
@@ -5,15 +5,12 @@ Tests for system utilities module.
 
 import unittest
 import os
-import sys
 import json
 import tempfile
 import re
 from unittest.mock import patch, MagicMock
 from io import StringIO
-
-# Add parent directory to path so we can import modules
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from types import MappingProxyType
 
 # Import functions to test
 from qcmd_cli.utils.system import (
@@ -23,6 +20,9 @@ from qcmd_cli.utils.system import (
 from qcmd_cli.log_analysis.monitor_state import active_log_monitors
 import re
 
+# Read-only config shared across tests; load_config results are only read
+_UPDATES_DISABLED_CFG = MappingProxyType({'disable_update_check': True})
+
 def strip_ansi_escape_codes(text):
     """Remove ANSI escape codes from the given text."""
     ansi_escape = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
@@ -148,9 +148,7 @@ class TestSystemUtilities(unittest.TestCase):
     def test_display_update_status_disabled(self, mock_load_config):
         """Test display_update_status when updates are disabled in config."""
         # Mock the config to disable update checks
-        mock_load_config.return_value = {
-            'disable_update_check': True
-        }
+        mock_load_config.return_value = _UPDATES_DISABLED_CFG
         
         # Call the function
         with patch('qcmd_cli.utils.system.check_for_updates') as mock_check:
@@ -166,6 +164,13 @@ class TestDisplaySystemStatus(unittest.TestCase):
     def setUp(self):
         """Set up test environment."""
         active_log_monitors.clear()
+        # Keep session cleanup away from the real sessions file
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        sessions_patch = patch('qcmd_cli.utils.session.SESSIONS_FILE',
+                               os.path.join(self.temp_dir.name, "sessions.json"))
+        sessions_patch.start()
+        self.addCleanup(sessions_patch.stop)
     
     @patch('sys.stdout', new_callable=StringIO)
     def test_display_system_status_with_active_monitors(self, mock_stdout):
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Tests for the log analyzer module.
+"""
+import unittest
+from unittest.mock import patch, mock_open
+from io import StringIO
+
+from qcmd_cli.log_analysis.analyzer import (
+    analyze_log_content, analyze_log_entry, analyze_log_file, read_large_file
+)
+
+class TestLogAnalyzer(unittest.TestCase):
+    """Test cases for log content and log file analysis."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Build the large log content and the analyzer's collaborator mocks once for the whole class."""
+        cls.LARGE_CONTENT = "\n".join(f"Line {i}" for i in range(1100))
+
+        # analyze_log_file reaches these through the module; the tests below that
+        # exercise the real functions call the names imported above instead. spec=True
+        # rather than autospec: an autospecced function stored on the class would bind
+        # to self when looked up through it
+        content_patcher = patch('qcmd_cli.log_analysis.analyzer.analyze_log_content', spec=True)
+        cls.mock_analyze_content = content_patcher.start()
+        cls.addClassCleanup(content_patcher.stop)
+        read_patcher = patch('qcmd_cli.log_analysis.analyzer.read_large_file', spec=True)
+        cls.mock_read = read_patcher.start()
+        cls.addClassCleanup(read_patcher.stop)
+
+    def setUp(self):
+        """Reset the shared collaborator mocks."""
+        self.mock_analyze_content.reset_mock()
+        self.mock_read.reset_mock(return_value=True)
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_analyze_log_content(self, mock_stdout):
+        """Test that line and error counts are reported for the content."""
+        content = "May 10 12:34:56 server test: Test log entry\nMay 10 12:35:00 server error: Error occurred\n"
+
+        analyze_log_content(content, "/var/log/test.log", "test-model")
+
+        output = mock_stdout.getvalue()
+        self.assertIn("Analyzing log content using test-model", output)
+        self.assertIn("File: /var/log/test.log", output)
+        self.assertIn("Total lines: 2", output)
+        self.assertIn("Potential errors/exceptions: 1", output)
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_analyze_log_content_large(self, mock_stdout):
+        """Test that every line of a large log is counted."""
+        analyze_log_content(self.LARGE_CONTENT, "/var/log/large.log")
+
+        output = mock_stdout.getvalue()
+        self.assertIn(f"Size: {len(self.LARGE_CONTENT)} bytes", output)
+        self.assertIn("Total lines: 1100", output)
+        self.assertIn("Potential errors/exceptions: 0", output)
+
+    def test_analyze_log_entry(self):
+        """Test the description chosen for each kind of log entry."""
+        self.assertIn("error occurred", analyze_log_entry("ERROR: disk full"))
+        self.assertIn("warning", analyze_log_entry("Warning: low memory"))
+        self.assertIn("informational", analyze_log_entry("INFO: started"))
+        self.assertIn("does not match", analyze_log_entry("started"))
+
+    @patch('os.path.exists', return_value=True)
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_analyze_log_file(self, mock_stdout, mock_exists):
+        """Test that a log file is read and its content analyzed."""
+        self.mock_read.return_value = "log line\n"
+
+        analyze_log_file("/var/log/test.log", "test-model")
+
+        self.mock_read.assert_called_once_with("/var/log/test.log")
+        self.mock_analyze_content.assert_called_once_with("log line\n", "/var/log/test.log", "test-model")
+
+    @patch('os.path.exists', return_value=True)
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_analyze_log_file_empty(self, mock_stdout, mock_exists):
+        """Test that an empty log file is reported and not analyzed."""
+        self.mock_read.return_value = ""
+
+        analyze_log_file("/var/log/empty.log")
+
+        self.assertIn("Log file is empty.", mock_stdout.getvalue())
+        self.mock_analyze_content.assert_not_called()
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_analyze_log_file_missing(self, mock_stdout):
+        """Test that a missing log file is reported without reading it."""
+        analyze_log_file("/nonexistent/app.log")
+
+        self.assertIn("Error: File /nonexistent/app.log not found.", mock_stdout.getvalue())
+        self.mock_read.assert_not_called()
+
+    def test_read_large_file(self):
+        """Test that a file read in several chunks is returned whole."""
+        data = 'x' * 1000 + '\n' + 'y' * 1000 + '\n' + 'z' * 1000 + '\n'
+        with patch('builtins.open', mock_open(read_data=data)) as mock_file:
+            content = read_large_file("/var/log/large.log", chunk_size=1000)
+
+        self.assertEqual(content, data)
+        mock_file.assert_called_once_with("/var/log/large.log", 'r', encoding='utf-8', errors='ignore')
+        self.assertEqual(mock_file().read.call_count, 5)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,485 @@
+#!/usr/bin/env python3
+"""
+Tests for log file discovery in the log_files module.
+"""
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from contextlib import ExitStack, contextmanager
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from io import StringIO
+
+from qcmd_cli.log_analysis.log_files import (
+    _capture_journal, _scan_log_dir, find_log_files, handle_log_selection, is_log_file, reset_log_memo
+)
+
+SYSTEMCTL_OUTPUT = (
+    "  UNIT              LOAD   ACTIVE SUB     DESCRIPTION\n"
+    "  nginx.service     loaded active running A high performance web server\n"
+    "  ssh.service       loaded active running OpenBSD Secure Shell server\n"
+)
+
+class _MemoryCache:
+    """In-memory stand-in for the log file cache, optionally failing to load or save."""
+
+    def __init__(self, data=None, load_error=None, save_error=None):
+        self.data = data
+        self.load_error = load_error
+        self.save_error = save_error
+
+    def load(self):
+        if self.load_error:
+            raise self.load_error
+        return self.data
+
+    def save(self, data):
+        if self.save_error:
+            raise self.save_error
+        self.data = data
+
+def _journal_entry(message, age=0):
+    """
+    Build a stand-in for a cysystemd journal entry from the nginx unit.
+    
+    Args:
+        message: The entry's MESSAGE field
+        age: Seconds between the entry being written and now
+        
+    Returns:
+        Object with the date, data and get_realtime_usec() of a JournalEntry
+    """
+    usec = int((time.time() - age) * 1_000_000)
+    return SimpleNamespace(date=datetime(2024, 5, 10, 12, 34, 56),
+                           data={'SYSLOG_IDENTIFIER': 'nginx', 'MESSAGE': message},
+                           get_realtime_usec=lambda: usec)
+
+class TestLogFilesAdditional(unittest.TestCase):
+    """Test cases for find_log_files and is_log_file."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Create one directory and log file shared read-only by every test, and patch load_config once."""
+        cls.temp_dir = tempfile.mkdtemp()
+        cls.temp_log_file = os.path.join(cls.temp_dir, "app.log")
+        with open(cls.temp_log_file, 'w') as f:
+            f.write("May 10 12:34:56 server test: Test log entry\n")
+        # Stands in for LOG_LOCATIONS; kept apart from the cache files so writing those leaves it unchanged
+        cls.log_root = os.path.join(cls.temp_dir, "logs") + os.sep
+        os.mkdir(cls.log_root)
+
+        # Tests set the config they need as this mock's return value
+        config_patcher = patch('qcmd_cli.log_analysis.log_files.load_config')
+        cls.mock_load_config = config_patcher.start()
+        cls.addClassCleanup(config_patcher.stop)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the shared directory."""
+        shutil.rmtree(cls.temp_dir, ignore_errors=True)
+
+    def setUp(self):
+        """Give each test its own cache file path; the file is only created by tests that need it."""
+        self.temp_cache_file = os.path.join(self.temp_dir, f"{self._testMethodName}.json")
+        self.addCleanup(self._remove_cache_file)
+        reset_log_memo()
+        self.addCleanup(reset_log_memo)
+        self.mock_load_config.reset_mock()
+        self.mock_load_config.return_value = {'favorite_logs': []}
+
+    def _remove_cache_file(self):
+        """Delete this test's cache file if the test created it."""
+        if os.path.exists(self.temp_cache_file):
+            os.unlink(self.temp_cache_file)
+
+    def _isfile(self, path):
+        """os.path.isfile that only reports the shared log file, so no system location is searched."""
+        return path == self.temp_log_file
+
+    @contextmanager
+    def _patch_log_files_env(self, config=None, search=True, **check_output_kwargs):
+        """
+        Set the config and patch the cache location, log locations, file system checks and systemctl
+        in one ExitStack.
+        
+        Args:
+            config: Config returned by load_config; defaults to the shared log as a favorite
+            search: Whether to restrict the file system search to the shared log file
+            check_output_kwargs: Configuration for the systemctl mock; defaults to
+                systemctl not being installed
+            
+        Yields:
+            The subprocess.check_output mock
+        """
+        if config is None:
+            config = {'favorite_logs': [self.temp_log_file]}
+        self.mock_load_config.return_value = config
+        if not check_output_kwargs:
+            check_output_kwargs = {'side_effect': FileNotFoundError}
+        with ExitStack() as stack:
+            stack.enter_context(patch('qcmd_cli.log_analysis.log_files.LOG_CACHE_FILE', self.temp_cache_file))
+            stack.enter_context(patch('qcmd_cli.log_analysis.log_files.LOG_LOCATIONS', [self.log_root]))
+            if search:
+                stack.enter_context(patch('os.path.isfile', side_effect=self._isfile))
+                stack.enter_context(patch('os.path.isdir', return_value=False))
+            yield stack.enter_context(patch('qcmd_cli.log_analysis.log_files.subprocess.check_output',
+                                            **check_output_kwargs))
+
+    def test_is_log_file(self):
+        """Test log file detection by file name."""
+        for name in ("app.log", "server.err", "job.out", "debug.txt", "ERROR_report", "syslog"):
+            self.assertTrue(is_log_file(name), name)
+        for name in ("notes.txt", "image.png", "main.py"):
+            self.assertFalse(is_log_file(name), name)
+
+    def test_scan_log_dir(self):
+        """Test that the directory search keeps to three levels and skips symlinked directories."""
+        with tempfile.TemporaryDirectory() as root:
+            location = root + os.sep
+            expected = []
+            for depth in range(5):
+                directory = os.path.join(root, *["sub"] * depth)
+                os.makedirs(directory, exist_ok=True)
+                for name in ("app.log", "notes.txt"):
+                    with open(os.path.join(directory, name), 'w'):
+                        pass
+                if depth <= 3:
+                    expected.append(os.path.join(directory, "app.log"))
+            os.symlink(os.path.join(root, "sub"), os.path.join(root, "linked"))
+
+            self.assertEqual(sorted(_scan_log_dir(location)), sorted(expected))
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_find_log_files_scan_limit(self, mock_stdout):
+        """Test that LOG_SCAN_LIMIT caps the log files found across all searched trees."""
+        with tempfile.TemporaryDirectory() as first, tempfile.TemporaryDirectory() as second:
+            for root in (first, second):
+                for i in range(3):
+                    with open(os.path.join(root, f"app{i}.log"), 'w'):
+                        pass
+
+            with self._patch_log_files_env(config={'favorite_logs': []}, search=False), \
+                    patch('qcmd_cli.log_analysis.log_files.LOG_LOCATIONS', [first + os.sep, second + os.sep]), \
+                    patch('qcmd_cli.log_analysis.log_files.LOG_SCAN_LIMIT', 4):
+                log_files = find_log_files(cache=_MemoryCache())
+
+        self.assertEqual(len(log_files), 4)
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_find_log_files_valid_cache(self, mock_stdout):
+        """Test that an unexpired cache is used and favorite logs are added to it."""
+        cache = _MemoryCache({'timestamp': time.time(), 'log_files': ['/var/log/syslog']})
+
+        with self._patch_log_files_env(search=False) as mock_check_output:
+            log_files = find_log_files(cache=cache)
+
+        self.assertEqual(log_files, ['/var/log/syslog', self.temp_log_file])
+        self.assertIn("Using cached log file list.", mock_stdout.getvalue())
+        mock_check_output.assert_not_called()
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_find_log_files_invalid_cache(self, mock_stdout):
+        """Test that an unreadable cache triggers a fresh search and is rewritten."""
+        cache = _MemoryCache(load_error=json.JSONDecodeError("Expecting value", "not json", 0))
+
+        with self._patch_log_files_env():
+            log_files = find_log_files(cache=cache)
+
+        self.assertEqual(log_files, [self.temp_log_file])
+        self.assertIn("Searching for log files...", mock_stdout.getvalue())
+        self.assertEqual(cache.data['log_files'], [self.temp_log_file])
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_find_log_files_json_file_cache(self, mock_stdout):
+        """Test that the default cache round-trips the file list through LOG_CACHE_FILE."""
+        with self._patch_log_files_env():
+            self.assertEqual(find_log_files(), [self.temp_log_file])
+        reset_log_memo()
+        with self._patch_log_files_env() as mock_check_output:
+            self.assertEqual(find_log_files(), [self.temp_log_file])
+
+        self.assertIn("Using cached log file list.", mock_stdout.getvalue())
+        mock_check_output.assert_not_called()
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_find_log_files_memo(self, mock_stdout):
+        """Test that a repeat call within the TTL reuses the result without searching or reading the cache."""
+        with self._patch_log_files_env() as mock_check_output:
+            first = find_log_files()
+            os.unlink(self.temp_cache_file)
+            second = find_log_files()
+
+        self.assertEqual(second, first)
+        self.assertIsNot(second, first)
+        self.assertEqual(mock_check_output.call_count, 1)
+        self.assertFalse(os.path.exists(self.temp_cache_file))
+
+        with patch('qcmd_cli.log_analysis.log_files.LOG_MEMO_TTL', 0), \
+                self._patch_log_files_env() as mock_check_output:
+            find_log_files()
+        mock_check_output.assert_called_once()
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_find_log_files_memo_invalidated_by_log_locations(self, mock_stdout):
+        """Test that the memo is dropped once a log location gains an entry, and only then."""
+        with tempfile.TemporaryDirectory() as root, self._patch_log_files_env() as mock_check_output, \
+                patch('qcmd_cli.log_analysis.log_files.LOG_LOCATIONS', [root + os.sep, self.temp_log_file]):
+            find_log_files()
+            find_log_files()
+            self.assertEqual(mock_check_output.call_count, 1)
+
+            # Without the file cache, only a fresh search can produce the next result
+            os.unlink(self.temp_cache_file)
+            with open(os.path.join(root, "new.log"), 'w'):
+                pass
+            os.utime(root, ns=(0, 0))  # Visible even where timestamps are coarse
+            find_log_files()
+            find_log_files()
+            self.assertEqual(mock_check_output.call_count, 2)
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_find_log_files_memo_ignores_volatile_locations(self, mock_stdout):
+        """Test that new entries in a frequently changing location such as /tmp keep the memo."""
+        with tempfile.TemporaryDirectory() as root, self._patch_log_files_env() as mock_check_output, \
+                patch('qcmd_cli.log_analysis.log_files.LOG_LOCATIONS', [root + os.sep]), \
+                patch('qcmd_cli.log_analysis.log_files._VOLATILE_LOG_LOCATIONS', {root + os.sep}):
+            find_log_files()
+            with open(os.path.join(root, "journal-capture"), 'w'):
+                pass
+            os.utime(root, ns=(0, 0))
+            find_log_files()
+
+        self.assertEqual(mock_check_output.call_count, 1)
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_find_log_files_cache_write_error(self, mock_stdout):
+        """Test that a cache that cannot be written is reported and the results still returned."""
+        cache = _MemoryCache(save_error=IOError("Permission denied"))
+
+        with self._patch_log_files_env():
+            log_files = find_log_files(cache=cache)
+
+        self.assertEqual(log_files, [self.temp_log_file])
+        self.assertIn("Could not cache log file list: Permission denied", mock_stdout.getvalue())
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_find_log_files_systemd_logs(self, mock_stdout):
+        """Test that running systemd services are listed as journalctl entries."""
+        with self._patch_log_files_env(config={}, return_value=SYSTEMCTL_OUTPUT):
+            log_files = find_log_files()
+
+        self.assertEqual(log_files, ['journalctl:nginx.service', 'journalctl:ssh.service'])
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_find_log_files_systemd_not_available(self, mock_stdout):
+        """Test that a missing or failing systemctl yields no journalctl entries."""
+        for error in (FileNotFoundError, subprocess.CalledProcessError(1, 'systemctl')):
+            with self.subTest(error=error):
+                # Each pass searches afresh rather than reading the previous pass's cache
+                if os.path.exists(self.temp_cache_file):
+                    os.unlink(self.temp_cache_file)
+                reset_log_memo()
+                with self._patch_log_files_env(side_effect=error):
+                    log_files = find_log_files()
+
+                self.assertEqual(log_files, [self.temp_log_file])
+
+    def _fake_journalctl(self, script):
+        """
+        Build a Popen replacement that records the journalctl command and runs a Python script instead.
+        
+        Args:
+            script: Python source to run in place of journalctl
+            
+        Returns:
+            Tuple of (Popen replacement, list of recorded commands)
+        """
+        commands = []
+        real_popen = subprocess.Popen
+
+        def fake_popen(cmd, **kwargs):
+            commands.append(cmd)
+            return real_popen([sys.executable, "-c", script], **kwargs)
+
+        return fake_popen, commands
+
+    def test_capture_journal_with_journalctl(self):
+        """Test that without cysystemd journalctl's output is streamed into the file."""
+        fake_popen, commands = self._fake_journalctl("print('entry 1'); print('entry 2')")
+        out_file = StringIO()
+
+        with patch('qcmd_cli.log_analysis.log_files.JournalReader', None), \
+                patch('qcmd_cli.log_analysis.log_files.subprocess.Popen', fake_popen):
+            _capture_journal("nginx.service", out_file, max_lines=50)
+
+        self.assertEqual(out_file.getvalue(), "entry 1\nentry 2\n")
+        self.assertEqual(commands, [["journalctl", "--no-pager", "-o", "short-iso", "-u", "nginx.service",
+                                     "-n", "50", "--since", "-7d"]])
+
+    def test_capture_journal_without_since(self):
+        """Test that journalctl is not bounded in time when since is None."""
+        fake_popen, commands = self._fake_journalctl("")
+
+        with patch('qcmd_cli.log_analysis.log_files.JournalReader', None), \
+                patch('qcmd_cli.log_analysis.log_files.subprocess.Popen', fake_popen):
+            _capture_journal("nginx.service", StringIO(), since=None)
+
+        self.assertNotIn("--since", commands[0])
+
+    def test_capture_journal_write_error(self):
+        """Test that journalctl is killed and reaped when writing its output fails."""
+        fake_popen, _ = self._fake_journalctl("import time; print('x' * (2 << 20), flush=True); time.sleep(30)")
+        processes = []
+
+        def recording_popen(cmd, **kwargs):
+            processes.append(fake_popen(cmd, **kwargs))
+            return processes[-1]
+
+        out_file = MagicMock()
+        out_file.write.side_effect = OSError("No space left on device")
+
+        with patch('qcmd_cli.log_analysis.log_files.JournalReader', None), \
+                patch('qcmd_cli.log_analysis.log_files.subprocess.Popen', recording_popen):
+            with self.assertRaises(OSError):
+                _capture_journal("nginx.service", out_file)
+
+        self.assertIsNotNone(processes[0].returncode)
+
+    @patch('qcmd_cli.log_analysis.log_files.analyze_log_file', autospec=True)
+    @patch('qcmd_cli.log_analysis.log_files._capture_journal', autospec=True)
+    @patch('builtins.input', return_value='a')
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_handle_log_selection_journal_config(self, mock_stdout, mock_input, mock_capture, mock_analyze):
+        """Test that the journal limits for a service selection come from the config."""
+        self.mock_load_config.return_value = {'journal_max_lines': 50, 'journal_since': '-1d'}
+
+        handle_log_selection("journalctl:nginx.service", "test-model")
+
+        self.assertEqual(mock_capture.call_args.kwargs, {'max_lines': 50, 'since': '-1d'})
+        self.assertEqual(mock_capture.call_args.args[0], "nginx.service")
+        mock_analyze.assert_called_once()
+
+    @patch('qcmd_cli.log_analysis.log_files.analyze_log_file', autospec=True)
+    @patch('qcmd_cli.log_analysis.log_files._capture_journal', autospec=True)
+    @patch('builtins.input', return_value='a')
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_handle_log_selection_journal_max_lines(self, mock_stdout, mock_input, mock_capture, mock_analyze):
+        """Test that journal_max_lines is read as a positive int, falling back to the default."""
+        for value, expected in (('50', 50), ('lots', 1000), (0, 1000), (-5, 1000), (None, 1000)):
+            with self.subTest(value=value):
+                self.mock_load_config.return_value = {'journal_max_lines': value}
+
+                handle_log_selection("journalctl:nginx.service", "test-model")
+
+                self.assertEqual(mock_capture.call_args.kwargs['max_lines'], expected)
+
+    def test_capture_journal_errors(self):
+        """Test that a failing or hanging journalctl is reported as a subprocess error."""
+        for script, error in (("import sys; sys.exit(1)", subprocess.CalledProcessError),
+                              ("import time; time.sleep(5)", subprocess.TimeoutExpired)):
+            with self.subTest(error=error.__name__):
+                fake_popen, _ = self._fake_journalctl(script)
+                with patch('qcmd_cli.log_analysis.log_files.JournalReader', None), \
+                        patch('qcmd_cli.log_analysis.log_files.subprocess.Popen', fake_popen):
+                    with self.assertRaises(error):
+                        _capture_journal("nginx.service", StringIO(), timeout=0.5)
+
+    @contextmanager
+    def _patch_journal_reader(self, entries):
+        """
+        Patch cysystemd's reader to hold the given entries, oldest first.
+        
+        Args:
+            entries: Journal entries the reader steps back through from its tail
+            
+        Yields:
+            Tuple of (reader mock, JournalOpenMode mock, Rule mock)
+        """
+        reader = MagicMock()
+        reader.previous.side_effect = list(reversed(entries)) + [None]
+        mock_rule = MagicMock()
+        with patch('qcmd_cli.log_analysis.log_files.JournalReader', return_value=reader), \
+                patch('qcmd_cli.log_analysis.log_files.JournalOpenMode', create=True) as mock_mode, \
+                patch('qcmd_cli.log_analysis.log_files.Rule', mock_rule, create=True):
+            yield reader, mock_mode, mock_rule
+
+    def test_capture_journal_with_cysystemd(self):
+        """Test that with cysystemd only the last entries of the unit are read, without a subprocess."""
+        entries = [_journal_entry(f'request {i}') for i in range(3)]
+        out_file = StringIO()
+
+        with self._patch_journal_reader(entries) as (reader, mock_mode, mock_rule), \
+                patch('qcmd_cli.log_analysis.log_files.subprocess.Popen') as mock_popen:
+            _capture_journal("nginx.service", out_file, max_lines=2)
+
+        self.assertEqual(out_file.getvalue(), "2024-05-10T12:34:56 nginx: request 1\n"
+                                              "2024-05-10T12:34:56 nginx: request 2\n")
+        reader.open.assert_called_once_with(mock_mode.SYSTEM)
+        # The same matches as journalctl -u: the unit's own entries, PID 1's lines about it and its core dumps
+        unit_matches = {args for args, _ in mock_rule.call_args_list if args[1] == "nginx.service"}
+        self.assertEqual(unit_matches, {("_SYSTEMD_UNIT", "nginx.service"), ("UNIT", "nginx.service"),
+                                        ("OBJECT_SYSTEMD_UNIT", "nginx.service"), ("COREDUMP_UNIT", "nginx.service")})
+        reader.add_filter.assert_called_once()
+        reader.seek_tail.assert_called_once_with()
+        self.assertEqual(reader.previous.call_count, 2)
+        reader.close.assert_called_once_with()
+        mock_popen.assert_not_called()
+
+    def test_capture_journal_reader_error_falls_back(self):
+        """Test that a journal the reader cannot open or read is fetched with journalctl instead."""
+        for method in ("open", "previous"):
+            with self.subTest(method=method):
+                fake_popen, commands = self._fake_journalctl("print('entry 1')")
+                out_file = StringIO()
+                with self._patch_journal_reader([]) as (reader, _, _), \
+                        patch('qcmd_cli.log_analysis.log_files.subprocess.Popen', fake_popen):
+                    getattr(reader, method).side_effect = PermissionError("Permission denied")
+                    _capture_journal("nginx.service", out_file)
+
+                self.assertEqual(out_file.getvalue(), "entry 1\n")
+                self.assertEqual(len(commands), 1)
+                reader.close.assert_called_once_with()
+
+    def test_capture_journal_with_cysystemd_since(self):
+        """Test that the cysystemd reader stops at entries older than since."""
+        entries = [_journal_entry('last week', age=7 * 86400), _journal_entry('yesterday', age=86400),
+                   _journal_entry('just now')]
+        for since, expected in (("-2d", ['yesterday', 'just now']),
+                                ("-12h", ['just now']),
+                                ("2000-01-01", ['last week', 'yesterday', 'just now']),
+                                (None, ['last week', 'yesterday', 'just now'])):
+            with self.subTest(since=since):
+                out_file = StringIO()
+                with self._patch_journal_reader(entries):
+                    _capture_journal("nginx.service", out_file, since=since)
+
+                self.assertEqual([line.rsplit(': ', 1)[1] for line in out_file.getvalue().splitlines()], expected)
+
+    def test_capture_journal_since_left_to_journalctl(self):
+        """Test that a since spec the reader cannot parse is passed to journalctl even with cysystemd."""
+        fake_popen, commands = self._fake_journalctl("")
+
+        with self._patch_journal_reader([]) as (reader, _, _), \
+                patch('qcmd_cli.log_analysis.log_files.subprocess.Popen', fake_popen):
+            _capture_journal("nginx.service", StringIO(), since="yesterday")
+
+        self.assertEqual(commands[0][-2:], ["--since", "yesterday"])
+        reader.previous.assert_not_called()
+
+    def test_capture_journal_with_cysystemd_timeout(self):
+        """Test that a journal read running past the timeout is reported like a hanging journalctl."""
+        clock = iter(range(100))
+
+        with self._patch_journal_reader([]), \
+                patch('qcmd_cli.log_analysis.log_files.time.monotonic', side_effect=lambda: next(clock)):
+            with self.assertRaises(subprocess.TimeoutExpired):
+                _capture_journal("nginx.service", StringIO(), timeout=0)
+
+if __name__ == '__main__':
+    unittest.main()
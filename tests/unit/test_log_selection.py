@@ -7,17 +7,31 @@ These tests ensure that:
 2. The function properly handles invalid selections by showing a clear error and allowing retry
 3. The function allows the user to quit
 """
-import sys
-import os
 import unittest
 from unittest.mock import patch, Mock
 from io import StringIO
 
-# Add parent directory to path to import modules
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
-
 from qcmd_cli.log_analysis.log_files import display_log_selection
-from qcmd_cli.ui.display import Colors
+
+def _inputs(*replies):
+    """
+    Build an input() replacement that returns the replies in order.
+    
+    Args:
+        replies: Strings to return, or exceptions to raise, one per call
+        
+    Returns:
+        Function to use as the input mock's side_effect
+    """
+    remaining = iter(replies)
+
+    def fake_input(*args):
+        reply = next(remaining)
+        if isinstance(reply, BaseException):
+            raise reply
+        return reply
+
+    return fake_input
 
 class TestLogSelection(unittest.TestCase):
     """Test cases for log selection functionality."""
@@ -54,7 +68,7 @@ class TestLogSelection(unittest.TestCase):
     def test_invalid_then_valid_selection(self, mock_stdout, mock_input):
         """Test invalid selection followed by valid selection."""
         # First provide invalid input, then valid input
-        mock_input.side_effect = ['5', '2']
+        mock_input.side_effect = _inputs('5', '2')
         
         # Call the function
         result = display_log_selection(self.log_files)
@@ -72,7 +86,7 @@ class TestLogSelection(unittest.TestCase):
     def test_non_numeric_then_valid_selection(self, mock_stdout, mock_input):
         """Test non-numeric input followed by valid selection."""
         # First provide non-numeric input, then valid input
-        mock_input.side_effect = ['abc', '1']
+        mock_input.side_effect = _inputs('abc', '1')
         
         # Call the function
         result = display_log_selection(self.log_files)
@@ -101,7 +115,7 @@ class TestLogSelection(unittest.TestCase):
     def test_multiple_retries_then_valid(self, mock_stdout, mock_input):
         """Test multiple invalid selections followed by a valid one."""
         # Multiple invalid inputs followed by valid
-        mock_input.side_effect = ['10', 'xyz', '0', '-1', '2']
+        mock_input.side_effect = _inputs('10', 'xyz', '0', '-1', '2')
         
         # Call the function
         result = display_log_selection(self.log_files)
@@ -116,5 +130,36 @@ class TestLogSelection(unittest.TestCase):
         self.assertIn("Invalid selection '0'", output)
         self.assertIn("Invalid selection '-1'", output)
 
+    @patch('builtins.input')
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_reply_variants(self, mock_stdout, mock_input):
+        """Test padded, signed, non-ASCII and differently cased replies."""
+        # (reply, expected selection, text expected in the output)
+        cases = [
+            (' 2 ', '/var/log/test2.log', None),
+            ('+3', '/var/log/test3.log', None),
+            ('QUIT', None, None),
+            ('\u00b2', None, "Please enter a number or 'q' to cancel"),
+            ('', None, "Please enter a number or 'q' to cancel"),
+        ]
+        for reply, expected, message in cases:
+            with self.subTest(reply=reply):
+                mock_stdout.seek(0)
+                mock_stdout.truncate()
+                mock_input.side_effect = _inputs(reply, 'q')
+                
+                self.assertEqual(display_log_selection(self.log_files), expected)
+                if message:
+                    self.assertIn(message, mock_stdout.getvalue())
+
+    @patch('builtins.input')
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_keyboard_interrupt(self, mock_stdout, mock_input):
+        """Test that Ctrl+C at the prompt cancels the selection."""
+        mock_input.side_effect = _inputs('abc', KeyboardInterrupt())
+        
+        self.assertIsNone(display_log_selection(self.log_files))
+        self.assertIn("Operation cancelled.", mock_stdout.getvalue())
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file